@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark performance-sensitive paths of the msoe scripts.
+
+Each subcommand times the current implementation against its faster alternative
+on synthetic (or supplied) input and checks that both produce identical results.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def best_time(func, repeat):
+    """Return (best wall-clock seconds over repeat calls, result of the last call)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def synthetic_listing(n_courses):
+    """Return an Acalog-like course listing page with n_courses course links."""
+    nav = "".join(
+        f'<li><a href="content.php?catoid=42&navoid={i}">Navigation {i}</a></li>'
+        for i in range(200)
+    )
+    rows = "".join(
+        f'<tr><td class="width"><ul><li>&#8226; <a href="preview_course_nopop.php'
+        f'?catoid=42&coid={i}" aria-expanded="false" onclick="showCourse(\'42\', '
+        f"'{i}', this); return false;\">CSC {1000 + i} - Topics in Computing "
+        f"&amp; Society {i}</a></li></ul></td></tr>"
+        for i in range(n_courses)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>MSOE</title></head>'
+        f'<body><ul id="nav">{nav}</ul><table class="table_default"><tr><td>'
+        '<span class="acalog_catalog_name">2025-2026 Undergraduate Catalog</span>'
+        f"</td></tr>{rows}</table></body></html>"
+    ).encode()
+
+
+def bench_catcourse_parse(args):
+    """Compare catcourse parse time per MB: BeautifulSoup vs. streaming engines."""
+    import catcourse  # pylint: disable=import-outside-toplevel
+
+    if args.file:
+        with open(args.file, "rb") as file:
+            content = file.read()
+    else:
+        content = synthetic_listing(args.courses)
+    base_url = "https://catalog.msoe.edu/content.php"
+    megabytes = len(content) / 2**20
+    print(f"Listing size: {megabytes:.2f} MB")
+
+    reference = None
+    for engine in ("bs4", *catcourse.STREAM_ENGINES):
+        seconds, result = best_time(
+            lambda e=engine: catcourse.parse_listing(content, base_url, e), args.repeat
+        )
+        if reference is None:
+            reference = result
+        status = "identical" if result == reference else "MISMATCH"
+        print(
+            f"{engine:>12}: {seconds / megabytes * 1000:8.1f} ms/MB, "
+            f"{len(result[1])} courses, {status}"
+        )
+
+
+def synthetic_so_form(path, filler_rows):
+    """Write an SO assessment form like those so.py reads, padded with filler rows."""
+    import openpyxl
+    import so
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Form"
+    for row in range(1, filler_rows + 1):
+        for col in "HIJKLMNOP":
+            sheet[f"{col}{row}"] = f"Rubric text {row}{col} " * 4
+    sheet["C3"], sheet["C5"], sheet["C7"] = "CE", "CPE2010", "Fall 2024"
+    sheet["G5"], sheet["G7"] = "1", "Instructor"
+    sheet["A10"], sheet["B17"] = "[SO 1] An ability to identify problems", 0.8
+    for level, row in zip(so.LEVEL, so.LEVEL_ROWS):
+        sheet[f"D{row}"], sheet[f"G{row}"] = level, row % 7
+    workbook.create_sheet("Instructions")["A1"] = "See the assessment process."
+    workbook.save(path)
+
+
+def bench_so_load(args):
+    """Compare so.py workbook loaders: time and peak Python memory per file."""
+    import so
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.files
+        if not paths:
+            paths = [os.path.join(tmp, "form.xlsx")]
+            synthetic_so_form(paths[0], args.filler_rows)
+
+        reference = None
+        for loader in ("openpyxl", "read_only", "xml"):
+            seconds, result = best_time(
+                lambda l=loader: [so.get_so_data(p, l) for p in paths], args.repeat
+            )
+            tracemalloc.start()
+            for path in paths:
+                so.get_so_data(path, loader)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            if reference is None:
+                reference = result
+            status = "identical" if result == reference else "MISMATCH"
+            print(
+                f"{loader:>10}: {seconds / len(paths) * 1000:8.1f} ms/file, "
+                f"peak {peak / 2**20:6.2f} MB, {status}"
+            )
+
+
+def synthetic_tree(root, n_roots, n_dirs, n_files):
+    """Create n_roots trees of nested directories holding plan-like text files."""
+    roots = []
+    for r in range(n_roots):
+        roots.append(os.path.join(root, f"root{r}"))
+        for d in range(n_dirs):
+            directory = os.path.join(roots[-1], f"advisor{d % 7}", f"cohort{d}")
+            if d % 10 == 0:
+                directory = os.path.join(directory, "courseHistories")
+            os.makedirs(directory, exist_ok=True)
+            for f in range(n_files):
+                name = f"Student{f:03d}_{r}_{d}.txt" if f % 2 else f"notes{f}.docx"
+                with open(os.path.join(directory, name), "w", encoding="utf-8"):
+                    pass
+    return roots
+
+
+def bench_scan(args):
+    """Compare os.walk and recursive glob against scantree for finding plan files."""
+    import fnmatch
+    from glob import glob
+
+    import scantree
+
+    pattern, prune = "Student0*.txt", {"courseHistories"}
+
+    def walk():
+        return sorted(
+            (path, os.path.getmtime(path))
+            for root in roots
+            for dirpath, _, filenames in os.walk(root)
+            for path in (
+                os.path.join(dirpath, f) for f in fnmatch.filter(filenames, pattern)
+            )
+            if "courseHistories" not in path
+        )
+
+    def globbed():
+        return sorted(
+            (path, os.path.getmtime(path))
+            for root in roots
+            for path in glob(f"{root}/**/{pattern}", recursive=True)
+            if "courseHistories" not in path
+        )
+
+    def scanned(workers):
+        found = scantree.scan_roots(roots, pattern, prune, True, workers)
+        return sorted((p, stat.st_mtime) for paths in found for p, stat in paths)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = args.roots or synthetic_tree(tmp, 5, args.dirs, args.files)
+        reference = None
+        for name, func in [
+            ("os.walk", walk),
+            ("glob", globbed),
+            ("scandir", lambda: scanned(1)),
+            (f"scandir x{len(roots)}", lambda: scanned(len(roots))),
+        ]:
+            seconds, result = best_time(func, args.repeat)
+            if reference is None:
+                reference = result
+            status = "identical" if result == reference else "MISMATCH"
+            print(
+                f"{name:>12}: {seconds * 1000:8.1f} ms, {len(result)} files, {status}"
+            )
+
+
+def synthetic_stat_plan(path, n_courses, seed):
+    """Write a STAT plan export like those findplan.py reads, with n_courses rows."""
+    import random
+
+    rng = random.Random(seed)
+    prefixes = ["CSC", "MTH", "PHY", "BUS", "HU", "SS", "MA", "EE"]
+    statuses = ["wip", "scheduled", "unscheduled", "unsuccessful", "NoCredit"]
+    lines = ["<STAT export>\n", "ID\tYear\tTerm\tCourse\n"]
+    for i in range(n_courses):
+        year, term = 2021 + i // 12, f"S{rng.randint(1, 3)}"
+        prefix = rng.choice(prefixes)
+        status = "successful" if year < 2024 else rng.choice(statuses)
+        fields = [f"{seed}", f"{year}", term, f"{prefix:<5}{rng.randint(1000, 5999)}"]
+        fields += [f"{rng.choice([2, 3, 4])}", status, f"Course {i}", "Last", "First"]
+        fields += ["CS", "JR", "last@msoe.edu", "", "", "", "", "", "Advisor", ""]
+        fields += ["", "", f"Requirement {i % 9}"]
+        lines.append("\t".join(fields) + "\n")
+        if i % 10 == 0:
+            lines.append(">note\n")
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(lines)
+
+
+def stringio_stat_table(fn):
+    """Return findplan.read_stat_table(fn) as read before comment lines streamed."""
+    from io import StringIO
+
+    import pandas as pd
+
+    import findplan
+
+    with open(fn, "r", encoding="utf-8") as file:
+        filtered_lines = [
+            line for line in file if not line.strip().startswith(("<", ">"))
+        ]
+    plan = pd.read_csv(
+        StringIO("".join(filtered_lines)),
+        sep="\t",
+        skiprows=1,
+        index_col=["Year", "Term"],
+        names=findplan.STAT_COLUMNS,
+        dtype={**findplan.STAT_DTYPES, "Status": "category"},
+    )
+    plan["Status"] = pd.Categorical(
+        plan["Status"], categories=findplan.STATUS_CATEGORIES
+    )
+    _, plan = findplan.extract_and_remove_fields(plan, findplan.STAT_STUDENT_FIELDS)
+    return plan
+
+
+def rowwise_stat_plan(fn):
+    """Return findplan.load_stat_plan(fn) as computed before vectorization."""
+    import numpy as np
+
+    import findplan
+
+    plan = stringio_stat_table(fn)
+    plan["Prefix"] = plan["Prefix_Number"].str[:5].str.rstrip()
+    plan["Number"] = plan["Prefix_Number"].str[5:]
+    plan = plan.drop("Prefix_Number", axis=1)
+    plan = plan.sort_values(["Prefix", "Number"])
+    plan = plan.sort_index(level=["Year", "Term"])
+    plan["SemCredits"] = plan.apply(
+        lambda row: (
+            row["Credits"]
+            if len(row["Prefix"]) == 3
+            else (2 / 3) * row["Credits"] if len(row["Prefix"]) == 2 else np.nan
+        ),
+        axis=1,
+    )
+    plan = plan[~plan["Status"].isin(["unsuccessful", "NoCredit", "missing"])]
+    for k in ["Credits", "SemCredits"]:
+        if np.all(plan[k] % 1 == 0):
+            plan[k] = plan[k].astype("int32")
+    return plan
+
+
+def bench_stat_plan(args):
+    """Compare STAT plan reading and loading: throughput and peak Python memory."""
+    import findplan
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.files
+        if not paths:
+            paths = [
+                os.path.join(tmp, f"Student{i:04d}.txt") for i in range(args.plans)
+            ]
+            for seed, path in enumerate(paths):
+                synthetic_stat_plan(path, args.courses, seed)
+
+        reference = {}
+        for step, name, load in [
+            ("read", "StringIO", stringio_stat_table),
+            ("read", "streamed", findplan.read_stat_table),
+            ("load", "row-wise", rowwise_stat_plan),
+            ("load", "vectorized", findplan.load_stat_plan),
+        ]:
+            seconds, result = best_time(
+                lambda l=load: [l(p) for p in paths], args.repeat
+            )
+            tracemalloc.start()
+            for path in paths:
+                load(path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            reference.setdefault(step, result)
+            same = all(
+                a.equals(b) and a.dtypes.equals(b.dtypes) and a.index.equals(b.index)
+                for a, b in zip(result, reference[step])
+            )
+            print(
+                f"{step} {name:>10}: {len(paths) / seconds:8.1f} plans/s, "
+                f"peak {peak / 2**20:6.2f} MB, {'identical' if same else 'MISMATCH'}"
+            )
+
+
+def main():
+    """Parse arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Timed repetitions (best is kept)"
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    sub = subparsers.add_parser("catcourse-parse", help=bench_catcourse_parse.__doc__)
+    sub.add_argument("-f", "--file", type=str, help="Saved listing page to parse")
+    sub.add_argument(
+        "-n", "--courses", type=int, default=5000, help="Courses in synthetic page"
+    )
+    sub.set_defaults(func=bench_catcourse_parse)
+
+    sub = subparsers.add_parser("so-load", help=bench_so_load.__doc__)
+    sub.add_argument("files", nargs="*", help="SO forms to load (default: synthetic)")
+    sub.add_argument(
+        "--filler_rows", type=int, default=200, help="Rows of filler in synthetic form"
+    )
+    sub.set_defaults(func=bench_so_load)
+
+    sub = subparsers.add_parser("scan", help=bench_scan.__doc__)
+    sub.add_argument("roots", nargs="*", help="Trees to scan (default: synthetic)")
+    sub.add_argument("--dirs", type=int, default=200, help="Directories per root")
+    sub.add_argument("--files", type=int, default=20, help="Files per directory")
+    sub.set_defaults(func=bench_scan)
+
+    sub = subparsers.add_parser("stat-plan", help=bench_stat_plan.__doc__)
+    sub.add_argument("files", nargs="*", help="STAT plans to load (default: synthetic)")
+    sub.add_argument("--plans", type=int, default=200, help="Synthetic plans")
+    sub.add_argument("--courses", type=int, default=48, help="Courses per plan")
+    sub.set_defaults(func=bench_stat_plan)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
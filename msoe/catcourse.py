@@ -8,14 +8,49 @@ Default university is 'msoe'. You can select others with -u/--university.
 
 For example, for a university not directly supported:
 ./catcourse.py -u charlotte -p ITSC -c 40 -n 4989
+or discover its catalogs once, after which -c and -n may be omitted:
+./catcourse.py -u charlotte --discover
+
+Several prefixes and catalogs can be fetched concurrently in one run:
+./catcourse.py -p CSC SWE CPE -c 40 42
+./catcourse.py -p CSC MTH --all_catalogs
+
+Compare two catalogs, e.g. UG AY25 against UG AY26:
+./catcourse.py -p CSC SWE --diff 40 42
+
+Listing pages are cached under ~/.cache/catcourse and revalidated with the server
+after --cache_ttl hours; --offline answers from the cache alone.
 """
 
 import argparse
+import codecs
+import collections
+import contextlib
+import csv
+import functools
+import hashlib
+import itertools
+import json
+import os
+import random
 import re
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
 import requests
 from bs4 import BeautifulSoup
 
+try:  # optional, used by the fastest streaming parser engine
+    from lxml import etree
+except ImportError:
+    etree = None
+
 # Known cur_cat_oid to navoid mappings per university.
 # Keep insertion order so we can choose a sensible default cur_cat_oid (the last entry).
 NAVOID_LOOKUP: dict[str, dict[int, int]] = {
@@ -62,9 +97,489 @@ def university_catalog_base(token: str) -> str:
 # This global will be set in main() based on selected university
 NAVOID: dict[int, int] = {}
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "catcourse")
+DEFAULT_REGISTRY = os.path.join(
+    os.path.expanduser("~"), ".config", "catcourse", "catalogs.json"
+)
+
+# HTTP behavior; main() may override these from the command line
+MAX_PER_HOST = 4  # concurrent requests to any one catalog server
+MAX_RETRIES = 5  # extra attempts after a retryable response or connection error
+BACKOFF_BASE = 0.5  # seconds; doubled per attempt, then fully jittered
+BACKOFF_MAX = 30.0
+# Acalog answers an empty 202 when it is busy; treat like 429/5xx
+RETRY_STATUS = {202, 429, 500, 502, 503, 504}
+
+_session: requests.Session | None = None
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_http_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session, creating it on first use."""
+    global _session
+    with _http_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=MAX_PER_HOST
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """Return the semaphore limiting concurrent requests to the host of url."""
+    host = urlsplit(url).netloc
+    with _http_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return _host_slots[host]
+
+
+def _retry_delay(attempt: int, response: requests.Response | None) -> float:
+    """Seconds to wait before the next attempt, honoring a numeric Retry-After."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def get_with_retry(
+    url: str, params: Mapping[str, str | int], headers: Mapping[str, str]
+) -> requests.Response:
+    """
+    GET url on the shared session, retrying with jittered exponential backoff.
+
+    Retries connection errors, timeouts and RETRY_STATUS responses up to MAX_RETRIES
+    times. The last response is returned (or the last exception raised) so callers
+    can report what went wrong.
+    """
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        with _host_slot(url):
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=10)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+        if response is not None and (
+            response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES
+        ):
+            return response
+        time.sleep(_retry_delay(attempt, response))  # sleep without holding a slot
+    raise AssertionError("unreachable")
+
+
+class ResponseCache:
+    """
+    On-disk cache of catalog listing pages for one university.
+
+    Entries are keyed on (university, course_prefix, cur_cat_oid, navoid). Each entry
+    is a body file plus a JSON metadata file holding the ETag/Last-Modified validators
+    and fetch time. Entries older than ttl are revalidated with a conditional request;
+    the least recently used entries are evicted once the cache exceeds max_bytes.
+    In offline mode only cached bodies are served, regardless of age. Parsed results
+    are kept beside each body, tagged with the body's sha224, so a page whose
+    content has not changed is never parsed twice.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        university: str,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 100 * 2**20,
+        offline: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.university = safe_university_token(university)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(
+        self, course_prefix: str, cur_cat_oid: int, navoid: int
+    ) -> tuple[str, str, int, int]:
+        """Return the cache key for a listing of this cache's university."""
+        return (self.university, course_prefix, cur_cat_oid, navoid)
+
+    def _paths(self, key: tuple[str, str, int, int]) -> tuple[str, str]:
+        digest = hashlib.sha224(json.dumps(key).encode()).hexdigest()
+        stem = os.path.join(self.directory, f"{key[0]}-{digest}")
+        return stem + ".html", stem + ".json"
+
+    def get(self, key: tuple[str, str, int, int]) -> tuple[bytes, dict] | None:
+        """Return (content, metadata) for a cached entry, or None if absent."""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(body_path, "rb") as file:
+                content = file.read()
+        except (OSError, ValueError):
+            return None  # missing or partially written entry
+        with contextlib.suppress(FileNotFoundError):  # evicted since it was read
+            os.utime(body_path)  # mark as recently used for eviction
+        return content, meta
+
+    def is_fresh(self, meta: dict) -> bool:
+        """Return True if an entry was fetched or revalidated within the TTL."""
+        return time.time() - meta["fetched"] < self.ttl
+
+    def put(
+        self,
+        key: tuple[str, str, int, int],
+        content: bytes,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Store a response body and its validators, then enforce the size bound."""
+        meta = {
+            "key": list(key),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            _atomic_write(body_path, content)
+            _atomic_write(meta_path, json.dumps(meta).encode())
+            self._evict()
+
+    def touch(self, key: tuple[str, str, int, int], meta: dict) -> None:
+        """Record a successful revalidation (HTTP 304) of an existing entry."""
+        meta = {**meta, "fetched": time.time()}
+        _, meta_path = self._paths(key)
+        with self._lock:
+            _atomic_write(meta_path, json.dumps(meta).encode())
+
+    def discard(self, key: tuple[str, str, int, int]) -> None:
+        """Remove an entry, e.g. a page that turned out not to be a listing."""
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            for path in (body_path, meta_path, self._parsed_path(key)):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+
+    def get_parsed(
+        self, key: tuple[str, str, int, int], digest: str
+    ) -> tuple[str, list[tuple[str, str, str]]] | None:
+        """Return the stored parse of an entry if it was made from content with digest."""
+        try:
+            with open(self._parsed_path(key), "r", encoding="utf-8") as file:
+                parsed = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if parsed["sha224"] != digest:
+            return None  # page changed since it was parsed
+        return parsed["catalog_title"], [tuple(link) for link in parsed["links"]]
+
+    def put_parsed(
+        self,
+        key: tuple[str, str, int, int],
+        digest: str,
+        result: tuple[str, list[tuple[str, str, str]]],
+    ) -> None:
+        """Store the parse of content with digest so unchanged pages need no parsing."""
+        parsed = {"sha224": digest, "catalog_title": result[0], "links": result[1]}
+        with self._lock:
+            _atomic_write(self._parsed_path(key), json.dumps(parsed).encode())
+            self._evict()
+
+    def _parsed_path(self, key: tuple[str, str, int, int]) -> str:
+        return self._paths(key)[0][: -len(".html")] + ".parsed.json"
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        An entry's size includes its metadata and parsed result as well as its
+        body; files left without a body are removed first.
+        """
+        entries: dict[str, list] = {}  # stem -> [body mtime, total size]
+        for entry in os.scandir(self.directory):
+            for suffix in (".parsed.json", ".json", ".html"):
+                if entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    stem = entry.path[: -len(suffix)]
+                    record = entries.setdefault(stem, [0.0, 0])
+                    record[1] += stat.st_size
+                    if suffix == ".html":
+                        record[0] = stat.st_mtime
+                    break
+        total = sum(size for _, size in entries.values())
+        for stem, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            for victim in (stem + ".html", stem + ".json", stem + ".parsed.json"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(victim)
+            total -= size
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to path via a temporary file so readers never see partial content."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def fetch_listing(
+    base_url: str,
+    params: dict[str, str | int],
+    cache: ResponseCache | None = None,
+    key: tuple[str, str, int, int] | None = None,
+) -> bytes:
+    """
+    Return the raw listing page, using and maintaining the cache when given.
+
+    A fresh cache entry is returned without a request; a stale one is revalidated
+    with If-None-Match/If-Modified-Since when the server supplied validators.
+    """
+    cached = cache.get(key) if cache and key else None
+    if cache and cache.offline:
+        if cached is None:
+            raise RuntimeError(f"Offline mode: no cached response for {key}")
+        return cached[0]
+    if cached and cache and cache.is_fresh(cached[1]):
+        return cached[0]
+
+    headers = {}
+    if cached:
+        if cached[1].get("etag"):
+            headers["If-None-Match"] = cached[1]["etag"]
+        if cached[1].get("last_modified"):
+            headers["If-Modified-Since"] = cached[1]["last_modified"]
+
+    response = get_with_retry(base_url, params, headers)
+    response.raise_for_status()  # Ensure we notice bad responses
+    if response.status_code == 304 and cached and cache and key:
+        cache.touch(key, cached[1])
+        return cached[0]
+    if response.status_code == 202 and not response.content:
+        raise RuntimeError(
+            f"Received an empty HTTP 202 response from {response.url}. "
+            "The site may require JavaScript or be blocking automated requests."
+        )
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Unexpected HTTP status {response.status_code} for {response.url}"
+        )
+    if not response.content:
+        raise RuntimeError(f"Received an empty response from {response.url}")
+
+    if cache and key:
+        cache.put(key, response.content, response.headers)
+    return response.content
+
+
+def _site_root(base_url: str) -> str:
+    """Derive the catalog site root used to form absolute course links."""
+    # Everything before '/content.php'
+    if "/content.php" in base_url:
+        return base_url.split("/content.php", 1)[0]
+    # Fallback: try to trim trailing path and use base
+    return base_url.rsplit("/", 1)[0]
+
+
+def _course_tuple(text: str, href: str, site_root: str) -> tuple[str, str, str]:
+    """Split link text into number and title and build the absolute course link."""
+    # Split into number and title at the first dash
+    parts = re.split(r"\s*-\s*", text, maxsplit=1)
+    course_number = parts[0].replace(" ", "")
+    course_title = parts[1].strip() if len(parts) > 1 else ""
+
+    # Build an absolute link; replace '_nopop' to get the full page
+    course_link = f"{site_root}/{href.replace('_nopop', '')}"
+
+    return course_number, course_title, course_link
+
+
+def parse_listing(
+    content: bytes, base_url: str, engine: str = "bs4"
+) -> tuple[str, list[tuple[str, str, str]]]:
+    """
+    Parse a listing page into its catalog title and (number, title, link) tuples.
+
+    engine selects "bs4" (full BeautifulSoup tree) or one of the streaming parsers
+    in STREAM_ENGINES; all engines produce identical results.
+    """
+    if engine != "bs4":
+        chunks = (
+            content[i : i + STREAM_CHUNK] for i in range(0, len(content), STREAM_CHUNK)
+        )
+        stream = ListingStream(chunks, base_url, engine)
+        course_links = list(stream)
+        if stream.catalog_title is None:
+            raise RuntimeError("Could not find catalog title on the page.")
+        return stream.catalog_title, course_links
+
+    soup = BeautifulSoup(content, "html.parser")
+    title_span = soup.find("span", class_="acalog_catalog_name")
+    if not title_span:
+        raise RuntimeError("Could not find catalog title on the page.")
+    catalog_title = title_span.get_text(strip=True)
+
+    site_root = _site_root(base_url)
+    course_links: list[tuple[str, str, str]] = []
+    for a_tag in soup.find_all("a", href=re.compile(r"^preview_course")):
+        text = a_tag.get_text(strip=True)
+        if not text:
+            continue  # Some entries might lack text; skip them gracefully
+        href = a_tag.get("href")
+        assert isinstance(href, str)
+        course_links.append(_course_tuple(text, href, site_root))
+
+    return catalog_title, course_links
+
+
+STREAM_CHUNK = 64 * 1024  # bytes fed to a streaming parser at a time
+STREAM_ENGINES = ("lxml", "html.parser") if etree is not None else ("html.parser",)
+
+
+class _ListingHTMLParser(HTMLParser):
+    """html.parser handler that records the catalog title and course links as seen."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.catalog_title: str | None = None
+        self.found: list[tuple[str, str]] = []  # (text, href) not yet consumed
+        self._title_depth = 0  # nesting depth inside the title span, 0 if outside
+        self._title_text: list[str] = []
+        self._href: str | None = None  # set while inside a course link
+        self._link_text: list[str] = []
+        self._pending: list[str] = []  # raw pieces of the current text node
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_text()
+        if self._title_depth:
+            self._title_depth += tag == "span"
+        elif tag == "span" and self.catalog_title is None:
+            classes = (dict(attrs).get("class") or "").split()
+            if "acalog_catalog_name" in classes:
+                self._title_depth = 1
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href and href.startswith("preview_course"):
+                self._href, self._link_text = href, []
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_text()
+        if tag == "span" and self._title_depth:
+            self._title_depth -= 1
+            if not self._title_depth:
+                self.catalog_title = "".join(self._title_text)
+        elif tag == "a" and self._href is not None:
+            self.found.append(("".join(self._link_text), self._href))
+            self._href = None
+
+    def handle_data(self, data: str) -> None:
+        # A text node may arrive in pieces when it spans fed chunks
+        if self._title_depth or self._href is not None:
+            self._pending.append(data)
+
+    def _flush_text(self) -> None:
+        """Finish the current text node, mirroring BeautifulSoup's get_text(strip=True)."""
+        if fragment := "".join(self._pending).strip():
+            if self._title_depth:
+                self._title_text.append(fragment)
+            if self._href is not None:
+                self._link_text.append(fragment)
+        self._pending.clear()
+
+
+class ListingStream:
+    """
+    Incrementally parse a listing page from an iterable of byte chunks.
+
+    Iterating yields (number, title, link) tuples as soon as each course link closes.
+    catalog_title is None until the title span has been parsed. The "lxml" engine
+    uses lxml's pull parser; "html.parser" uses the standard library.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        base_url: str,
+        engine: str = STREAM_ENGINES[0],
+        encoding: str = "utf-8",
+    ) -> None:
+        if engine not in STREAM_ENGINES:
+            raise ValueError(f"Unavailable streaming parser engine: {engine}")
+        self.chunks = chunks
+        self.site_root = _site_root(base_url)
+        self.engine = engine
+        self.encoding = encoding
+        self.catalog_title: str | None = None
+
+    def __iter__(self) -> Iterator[tuple[str, str, str]]:
+        if self.engine == "lxml":
+            yield from self._iter_lxml()
+        else:
+            yield from self._iter_html_parser()
+
+    def _iter_html_parser(self) -> Iterator[tuple[str, str, str]]:
+        handler = _ListingHTMLParser()
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        for final, chunk in _mark_last(self.chunks):
+            handler.feed(decoder.decode(chunk, final=final))
+            if final:
+                handler.close()
+            self.catalog_title = handler.catalog_title
+            for text, href in handler.found:
+                if text:  # Some entries might lack text; skip them gracefully
+                    yield _course_tuple(text, href, self.site_root)
+            handler.found.clear()
+
+    def _iter_lxml(self) -> Iterator[tuple[str, str, str]]:
+        assert etree is not None
+        pull = etree.HTMLPullParser(events=("end",), encoding=self.encoding)
+        for final, chunk in _mark_last(self.chunks):
+            pull.feed(chunk)
+            if final:
+                pull.close()
+            for _, element in pull.read_events():
+                if element.tag == "a":
+                    href = element.get("href")
+                    if href and href.startswith("preview_course"):
+                        text = "".join(t.strip() for t in element.itertext())
+                        if text:
+                            yield _course_tuple(text, href, self.site_root)
+                elif element.tag == "span" and self.catalog_title is None:
+                    if "acalog_catalog_name" in (element.get("class") or "").split():
+                        self.catalog_title = "".join(
+                            t.strip() for t in element.itertext()
+                        )
+                elif element.tag == "tr":
+                    element.clear(keep_tail=True)  # finished rows are not needed
+
+
+def _mark_last(chunks: Iterable[bytes]) -> Iterator[tuple[bool, bytes]]:
+    """Yield (is_last, chunk) so parsers can be closed on the final chunk."""
+    iterator = iter(chunks)
+    previous = next(iterator, None)
+    if previous is None:
+        yield True, b""
+        return
+    for chunk in iterator:
+        yield False, previous
+        previous = chunk
+    yield True, previous
+
 
 def fetch_and_parse_url(
-    base_url: str, course_prefix: str, cur_cat_oid: int, navoid: int
+    base_url: str,
+    course_prefix: str,
+    cur_cat_oid: int,
+    navoid: int,
+    cache: ResponseCache | None = None,
+    engine: str = "bs4",
 ) -> tuple[str, list[tuple[str, str, str]]]:
     """
     Fetch the webpage and parse it for course links.
@@ -74,6 +589,8 @@ def fetch_and_parse_url(
     course_prefix (str): The course prefix (e.g., 'CSC').
     cur_cat_oid (int): The cur_cat_oid parameter value.
     navoid (int): The navoid parameter value, -1 to infer from cur_cat_oid
+    cache (ResponseCache | None): Optional on-disk response cache.
+    engine (str): Parser engine, "bs4" or one of STREAM_ENGINES.
 
     Returns:
     catalog_title (str)
@@ -90,57 +607,318 @@ def fetch_and_parse_url(
         "cur_cat_oid": cur_cat_oid,
         "navoid": navoid,
     }
-    response = requests.get(base_url, params=params, timeout=10)
-    response.raise_for_status()  # Ensure we notice bad responses
-    if response.status_code == 202 and not response.content:
-        raise RuntimeError(
-            f"Received an empty HTTP 202 response from {response.url}. "
-            "The site may require JavaScript or be blocking automated requests."
-        )
-    if response.status_code != 200:
+    if cache is None:
+        return parse_listing(fetch_listing(base_url, params), base_url, engine)
+
+    key = cache.key(course_prefix, cur_cat_oid, navoid)
+    content = fetch_listing(base_url, params, cache, key)
+    digest = hashlib.sha224(content).hexdigest()
+    if (result := cache.get_parsed(key, digest)) is None:
+        try:
+            result = parse_listing(content, base_url, engine)
+        except RuntimeError:
+            # e.g. a busy or interstitial page served with 200: refetch next time
+            cache.discard(key)
+            raise
+        cache.put_parsed(key, digest, result)
+    return result
+
+
+def fetch_and_parse_many(
+    base_url: str,
+    queries: Sequence[tuple[str, int, int]],
+    max_workers: int = 8,
+    cache: ResponseCache | None = None,
+    engine: str = "bs4",
+) -> Iterator[tuple[str, int, str, list[tuple[str, str, str]]]]:
+    """
+    Fetch and parse several listings concurrently, yielding results in query order.
+
+    Parameters:
+    base_url (str): As for fetch_and_parse_url.
+    queries (Sequence[tuple[str, int, int]]): (course_prefix, cur_cat_oid, navoid) tuples.
+    max_workers (int): Maximum number of requests in flight at once.
+    cache (ResponseCache | None): Optional on-disk response cache.
+    engine (str): Parser engine, "bs4" or one of STREAM_ENGINES.
+
+    Yields:
+    (course_prefix, cur_cat_oid, catalog_title, course_links) for each query, in the
+    order given regardless of which request finishes first.
+    """
+    # At most max_workers listings are in flight or waiting to be yielded, so
+    # memory stays bounded however many queries there are
+    workers = max(1, min(max_workers, len(queries)))
+    remaining = iter(queries)
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+
+        def submit_next() -> None:
+            for prefix, cur_cat_oid, navoid in itertools.islice(remaining, 1):
+                future = ex.submit(
+                    fetch_and_parse_url,
+                    base_url,
+                    prefix,
+                    cur_cat_oid,
+                    navoid,
+                    cache,
+                    engine,
+                )
+                pending.append((prefix, cur_cat_oid, future))
+
+        for _ in range(workers):
+            submit_next()
+        while pending:
+            prefix, cur_cat_oid, future = pending.popleft()
+            catalog_title, course_links = future.result()
+            del future  # drop the finished future and its result
+            submit_next()
+            yield prefix, cur_cat_oid, catalog_title, course_links
+
+
+def _get_page(url: str) -> bytes:
+    """Fetch a small catalog page (not cached) and return its body."""
+    response = get_with_retry(url, {}, {})
+    response.raise_for_status()
+    if response.status_code != 200 or not response.content:
         raise RuntimeError(
             f"Unexpected HTTP status {response.status_code} for {response.url}"
         )
-    if not response.content:
-        raise RuntimeError(f"Received an empty response from {response.url}")
+    return response.content
 
-    soup = BeautifulSoup(response.content, "html.parser")
-    title_span = soup.find("span", class_="acalog_catalog_name")
-    if not title_span:
-        raise RuntimeError("Could not find catalog title on the page.")
-    catalog_title = title_span.get_text(strip=True)
 
-    # Derive catalog site root from base_url (everything before '/content.php')
-    # to correctly form absolute links for each course.
-    if "/content.php" in base_url:
-        site_root = base_url.split("/content.php", 1)[0]
-    else:
-        # Fallback: try to trim trailing path and use base
-        site_root = base_url.rsplit("/", 1)[0]
+# Navigation link text of the page listing every course, e.g. "Course Descriptions"
+_COURSES_NAV_RE = re.compile(r"^\s*courses?(\s+(descriptions?|listings?))?\s*$", re.I)
 
-    course_links: list[tuple[str, str, str]] = []
-    for a_tag in soup.find_all("a", href=re.compile(r"^preview_course")):
-        text = a_tag.get_text(strip=True)
-        if not text:
-            continue  # Some entries might lack text; skip them gracefully
 
-        # Split into number and title at the first dash
-        parts = re.split(r"\s*-\s*", text, maxsplit=1)
-        course_number = parts[0].replace(" ", "")
-        course_title = parts[1].strip() if len(parts) > 1 else ""
+def discover_catalogs(
+    catalog_base: str, max_workers: int = 8
+) -> dict[int, dict[str, str | int]]:
+    """
+    Crawl a university's catalog index for every cur_cat_oid and its course navoid.
 
-        # Build an absolute link; replace '_nopop' to get the full page
-        href = a_tag.get("href")
-        assert isinstance(href, str)
-        course_link = f"{site_root}/{href.replace('_nopop', '')}"
+    The catalog selector on index.php lists each catalog; each catalog's home page
+    links to its course listing as content.php?catoid=...&navoid=....
 
-        course_links.append((course_number, course_title, course_link))
+    Returns:
+    dict mapping cur_cat_oid to {"navoid": int, "title": str}, in ascending
+    cur_cat_oid order. Catalogs without a recognizable course listing are omitted.
+    """
+    soup = BeautifulSoup(_get_page(f"{catalog_base}/index.php"), "html.parser")
+    titles: dict[int, str] = {}
+    for select in soup.find_all("select"):
+        if "catalog" not in f"{select.get('name')} {select.get('id')}".lower():
+            continue
+        for option in select.find_all("option"):
+            value = str(option.get("value", ""))
+            if value.isdigit():
+                titles[int(value)] = option.get_text(strip=True)
+    if not titles:
+        raise RuntimeError(f"Could not find a catalog selector at {catalog_base}")
 
-    return catalog_title, course_links
+    def course_navoid(oid: int) -> int | None:
+        page = BeautifulSoup(
+            _get_page(f"{catalog_base}/index.php?catoid={oid}"), "html.parser"
+        )
+        href_re = re.compile(rf"content\.php\?catoid={oid}&(amp;)?navoid=(\d+)")
+        for a_tag in page.find_all("a", href=href_re):
+            if _COURSES_NAV_RE.match(a_tag.get_text(strip=True)):
+                match = href_re.search(str(a_tag.get("href")))
+                assert match is not None
+                return int(match[2])
+        return None
+
+    oids = sorted(titles)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(oids)))) as ex:
+        navoids = list(ex.map(course_navoid, oids))
+    return {
+        oid: {"navoid": navoid, "title": titles[oid]}
+        for oid, navoid in zip(oids, navoids)
+        if navoid is not None
+    }
+
+
+@functools.cache
+def load_registry(path: str) -> dict[str, dict[int, int]]:
+    """
+    Load the discovered-catalog registry as {university: {cur_cat_oid: navoid}}.
+
+    Read at most once per process; a missing file is an empty registry.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            raw = json.load(file)
+    except FileNotFoundError:
+        return {}
+    return {
+        uni: {int(oid): entry["navoid"] for oid, entry in catalogs.items()}
+        for uni, catalogs in raw.items()
+    }
+
+
+def save_registry(
+    path: str, university: str, catalogs: dict[int, dict[str, str | int]]
+) -> None:
+    """Replace one university's entries in the registry file, keeping the others."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            raw = json.load(file)
+    except FileNotFoundError:
+        raw = {}
+    raw[university] = {str(oid): entry for oid, entry in catalogs.items()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_write(path, json.dumps(raw, indent=2, sort_keys=True).encode())
+    load_registry.cache_clear()
+
+
+def diff_listings(
+    old_links: list[tuple[str, str, str]], new_links: list[tuple[str, str, str]]
+) -> dict[str, list[tuple[str, ...]]]:
+    """
+    Compare two listings of (number, title, link) tuples by course number.
+
+    Links always differ between catalogs, so only (number, title) pairs are
+    compared; the symmetric difference of those sets isolates the few courses
+    that need classifying.
+
+    Returns:
+    dict with "added" and "removed" lists of (number, title, link) and a
+    "retitled" list of (number, old_title, new_title), each sorted by number.
+    """
+    old = {number: (title, link) for number, title, link in old_links}
+    new = {number: (title, link) for number, title, link in new_links}
+    changed = {(n, old[n][0]) for n in old} ^ {(n, new[n][0]) for n in new}
+    changed_numbers = {number for number, _ in changed}
+    return {
+        "added": [(n, *new[n]) for n in sorted(changed_numbers - old.keys())],
+        "removed": [(n, *old[n]) for n in sorted(changed_numbers - new.keys())],
+        "retitled": [
+            (n, old[n][0], new[n][0])
+            for n in sorted(changed_numbers & old.keys() & new.keys())
+        ],
+    }
+
+
+def print_diff(
+    prefix: str,
+    old_title: str,
+    new_title: str,
+    diff: dict[str, list[tuple[str, ...]]],
+) -> None:
+    """Print one prefix's catalog differences; new courses use reference-link form."""
+    counts = ", ".join(f"{len(v)} {k}" for k, v in diff.items())
+    print(f"## {prefix}: {old_title} -> {new_title} ({counts})")
+    for number, title, link in diff["added"]:
+        print(f'+ [{number}]: {link} "{title}"')
+    for number, title, link in diff["removed"]:
+        print(f'- [{number}]: {link} "{title}"')
+    for number, old, new in diff["retitled"]:
+        print(f'~ {number}: "{old}" -> "{new}"')
+
+
+# Column order of the structured export formats
+EXPORT_FIELDS = (
+    "university",
+    "catalog_title",
+    "cur_cat_oid",
+    "prefix",
+    "number",
+    "title",
+    "link",
+)
+EXPORT_FORMATS = ("markdown", "jsonl", "csv", "parquet")
+_FORMAT_BY_EXTENSION = {
+    ".md": "markdown",
+    ".jsonl": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+
+def _records(
+    university: str,
+    cur_cat_oid: int,
+    prefix: str,
+    catalog_title: str,
+    course_links: list[tuple[str, str, str]],
+) -> list[tuple]:
+    """Flatten one listing into EXPORT_FIELDS tuples."""
+    return [
+        (university, catalog_title, cur_cat_oid, prefix, *course)
+        for course in course_links
+    ]
+
+
+@contextlib.contextmanager
+def record_writer(fmt: str, path: str) -> Iterator[Callable[..., None]]:
+    """
+    Open an export sink and yield a function that writes one fetched listing.
+
+    The yielded function takes (university, cur_cat_oid, prefix, catalog_title,
+    course_links). Each listing is written (and, for Parquet, becomes a row group)
+    as soon as it is passed in, so memory use is bounded by the largest single
+    listing rather than the whole crawl. path "-" is stdout.
+    """
+    if fmt == "parquet":
+        if path == "-":
+            raise ValueError("Parquet output requires -o/--output")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                (f, pa.int32() if f == "cur_cat_oid" else pa.string())
+                for f in EXPORT_FIELDS
+            ]
+        )
+        with pq.ParquetWriter(path, schema) as parquet:
+
+            def write_parquet(*listing) -> None:
+                if records := _records(*listing):
+                    columns = [list(column) for column in zip(*records)]
+                    parquet.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+            yield write_parquet
+        return
+
+    with contextlib.ExitStack() as stack:
+        if path == "-":
+            file = sys.stdout
+        else:
+            file = stack.enter_context(
+                open(path, "w", encoding="utf-8", newline="" if fmt == "csv" else None)
+            )
+
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(EXPORT_FIELDS)
+            yield lambda *listing: writer.writerows(_records(*listing))
+        elif fmt == "jsonl":
+
+            def write_jsonl(*listing) -> None:
+                for record in _records(*listing):
+                    file.write(json.dumps(dict(zip(EXPORT_FIELDS, record))) + "\n")
+
+            yield write_jsonl
+        else:
+            last_title = None
+
+            def write_markdown(*listing) -> None:
+                nonlocal last_title
+                catalog_title, course_links = listing[3:]
+                if catalog_title != last_title:  # listings arrive grouped by catalog
+                    print(catalog_title, file=file)
+                    last_title = catalog_title
+                for course_number, course_title, course_link in course_links:
+                    print(
+                        f'[{course_number}]: {course_link} "{course_title}"', file=file
+                    )
+
+            yield write_markdown
 
 
 def main() -> None:
     """Parse arguments, fetch the webpage, and print results."""
+    global MAX_PER_HOST, MAX_RETRIES
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -153,14 +931,26 @@ def main() -> None:
         help="University token (before '.edu'), e.g. 'msoe' or 'unt'.",
     )
     parser.add_argument(
-        "-p", "--course_prefix", type=str, default="CSC", help="Course prefix"
+        "-p",
+        "--course_prefix",
+        type=str,
+        nargs="+",
+        default=["CSC"],
+        help="Course prefix(es)",
     )
     # Note: default for cur_cat_oid is resolved dynamically after we know the university
     parser.add_argument(
         "-c",
         "--cur_cat_oid",
         type=int,
-        help="cur_cat_oid (defaults to the latest known for the selected university if omitted)",
+        nargs="+",
+        help="cur_cat_oid(s) (defaults to the latest known for the selected university if omitted)",
+    )
+    parser.add_argument(
+        "-a",
+        "--all_catalogs",
+        action="store_true",
+        help="Fetch every known cur_cat_oid for the selected university",
     )
     parser.add_argument(
         "-n",
@@ -169,8 +959,97 @@ def main() -> None:
         default=-1,
         help="navoid (use -1 to infer from built-in mapping when available)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent requests",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for cached catalog pages",
+    )
+    parser.add_argument(
+        "--cache_ttl",
+        type=float,
+        default=7 * 24,
+        help="Hours before a cached page is revalidated with the server",
+    )
+    parser.add_argument(
+        "--cache_max_mb",
+        type=float,
+        default=100,
+        help="Size bound for the cache; least recently used pages are evicted",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        choices=("bs4", *STREAM_ENGINES),
+        default="bs4",
+        help="HTML parser; the streaming engines are faster on large listings",
+    )
+    parser.add_argument(
+        "--per_host",
+        type=int,
+        default=MAX_PER_HOST,
+        help="Maximum concurrent requests to one catalog server",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=MAX_RETRIES,
+        help="Retries for busy (202/429/5xx) responses and connection errors",
+    )
+    parser.add_argument(
+        "--registry",
+        type=str,
+        default=DEFAULT_REGISTRY,
+        help="File of discovered cur_cat_oid to navoid mappings",
+    )
+    parser.add_argument(
+        "--discover",
+        action="store_true",
+        help="Crawl the university's catalog index, update the registry, and exit",
+    )
+    parser.add_argument(
+        "--diff",
+        type=int,
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Report courses added, removed or retitled between two cur_cat_oids",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="-",
+        help="Output file ('-' for stdout)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=EXPORT_FORMATS,
+        help="Output format (default: from --output extension, else markdown)",
+    )
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--no_cache", action="store_true", help="Neither read nor write the cache"
+    )
+    cache_mode.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve only from the cache; never contact the server",
+    )
 
     args = parser.parse_args()
+    if args.jobs < 1 or args.per_host < 1:
+        parser.error("-j/--jobs and --per_host must be at least 1.")
+    if args.retries < 0:
+        parser.error("--retries cannot be negative.")
+    MAX_PER_HOST, MAX_RETRIES = args.per_host, args.retries
 
     try:
         uni_token = safe_university_token(args.university)
@@ -178,43 +1057,107 @@ def main() -> None:
         parser.error(str(e))
         return  # unreachable, but keeps type-checkers happy
 
-    # Determine NAVOID mapping for this university (if known)
+    if args.discover:
+        catalogs = discover_catalogs(university_catalog_base(uni_token), args.jobs)
+        if not catalogs:
+            raise RuntimeError(f"No course listings found for university '{uni_token}'")
+        save_registry(args.registry, uni_token, catalogs)
+        for oid, entry in catalogs.items():
+            print(f"{oid}: {entry['navoid']}  # {entry['title']}")
+        print(f"Saved {len(catalogs)} catalogs to {args.registry}")
+        return
+
+    # Determine NAVOID mapping for this university (if known). Built-in mappings
+    # suffice for the common case; only consult the registry when they do not.
     known_mapping = NAVOID_LOOKUP.get(uni_token)
+    if (
+        not known_mapping
+        or args.all_catalogs
+        or any(
+            c not in known_mapping for c in (args.cur_cat_oid or []) + (args.diff or [])
+        )
+    ):
+        discovered = load_registry(args.registry).get(uni_token, {})
+        merged = {**discovered, **(known_mapping or {})}
+        known_mapping = {oid: merged[oid] for oid in sorted(merged)}
 
     # Resolve cur_cat_oid default (if needed) based on mapping (if known)
     if known_mapping:
         # Use the last key by insertion order as the default catalog oid
         default_cur = list(known_mapping.keys())[-1]
     else:
-        default_cur = None  # Unknown: user must supply -c and -n
+        default_cur = None  # Unknown: user must supply -c and -n (or --discover)
 
-    # Choose final cur_cat_oid
-    cur_cat_oid: int | None = args.cur_cat_oid
-    if cur_cat_oid is None:
-        cur_cat_oid = default_cur
+    # Choose final cur_cat_oid(s)
+    if args.diff:
+        if args.all_catalogs or args.cur_cat_oid is not None:
+            parser.error("--diff cannot be combined with -a or -c.")
+        if args.output != "-" or args.format not in (None, "markdown"):
+            parser.error("--diff writes a markdown report to stdout only.")
+        cur_cat_oids: list[int] = args.diff
+    elif args.all_catalogs:
+        if args.cur_cat_oid is not None:
+            parser.error("-a/--all_catalogs cannot be combined with -c/--cur_cat_oid.")
+        if not known_mapping:
+            parser.error(f"No known catalogs for university '{uni_token}'.")
+        cur_cat_oids = list(known_mapping.keys())
+    elif args.cur_cat_oid is not None:
+        cur_cat_oids = list(dict.fromkeys(args.cur_cat_oid))  # dedupe, keep order
+    elif default_cur is not None:
+        cur_cat_oids = [default_cur]
+    else:
+        cur_cat_oids = []
+
+    # An explicit navoid belongs to exactly one catalog
+    if args.navoid != -1 and len(cur_cat_oids) > 1:
+        parser.error("-n/--navoid can only be used with a single -c/--cur_cat_oid.")
 
     # If university is unknown, require both -c and -n (navoid must not be -1)
     if known_mapping:
         global NAVOID
         NAVOID = known_mapping.copy()
     else:
-        if cur_cat_oid is None or args.navoid == -1:
+        if not cur_cat_oids or args.navoid == -1:
             parser.error(
-                f"Unknown university '{uni_token}'. Supply both -c/--cur_cat_oid and -n/--navoid."
+                f"Unknown university '{uni_token}'. Supply both -c/--cur_cat_oid and "
+                "-n/--navoid, or run once with --discover."
             )
-    assert cur_cat_oid is not None
+    assert cur_cat_oids
 
     # Build base URL for the selected university
     catalog_base = university_catalog_base(uni_token)
     base_url = f"{catalog_base}/content.php"
 
-    catalog_title, course_links = fetch_and_parse_url(
-        base_url, args.course_prefix, cur_cat_oid, args.navoid
-    )
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_dir,
+            uni_token,
+            ttl=args.cache_ttl * 3600,
+            max_bytes=int(args.cache_max_mb * 2**20),
+            offline=args.offline,
+        )
 
-    print(catalog_title)
-    for course_number, course_title, course_link in course_links:
-        print(f'[{course_number}]: {course_link} "{course_title}"')
+    prefixes = list(dict.fromkeys(args.course_prefix))
+    queries = [(p, c, args.navoid) for c in cur_cat_oids for p in prefixes]
+
+    if args.diff:
+        results = fetch_and_parse_many(base_url, queries, args.jobs, cache, args.engine)
+        old_results = {p: r for p, _, *r in itertools.islice(results, len(prefixes))}
+        for prefix, _, new_title, new_links in results:
+            old_title, old_links = old_results[prefix]
+            diff = diff_listings(old_links, new_links)
+            print_diff(prefix, old_title, new_title, diff)
+        return
+
+    fmt = args.format or _FORMAT_BY_EXTENSION.get(
+        os.path.splitext(args.output)[1].lower(), "markdown"
+    )
+    with record_writer(fmt, args.output) as write:
+        for prefix, cur_cat_oid, catalog_title, course_links in fetch_and_parse_many(
+            base_url, queries, args.jobs, cache, args.engine
+        ):
+            write(uni_token, cur_cat_oid, prefix, catalog_title, course_links)
 
 
 if __name__ == "__main__":
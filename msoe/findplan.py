@@ -3,16 +3,23 @@
 """Find, select, and copy to clipboard MSOE STAT advising file for a given student."""
 
 import argparse
+import contextlib
+import fnmatch
+import functools
 import hashlib
 import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from glob import glob
-from io import StringIO
 from warnings import warn
 
 import numpy as np
 import pandas as pd
 import pyperclip
 
+from scantree import directory_key, scan_roots
+
 
 def ranged_input(upper_end):
     """Prompt the user until they enter an int between 0 and argument."""
@@ -43,6 +50,30 @@ def file_sha224(pth):
         raise ValueError(f"An error occurred while processing {pth}: {str(e)}") from e
 
 
+@functools.lru_cache(maxsize=4096)
+def _sha224_of_version(pth, size, mtime_ns):
+    """Memoize file_sha224 per file version in this process; an edit makes a new key."""
+    return file_sha224(pth)
+
+
+def file_sha224_many(pths, stats, workers=8):
+    """
+    Return file_sha224 for each path, given its os.stat_result.
+
+    Hashes are memoized (LRU) on (path, size, mtime_ns) for the life of the
+    process, which helps batch lookups (get_plans_many) and long-running callers
+    such as msml's interactive mode; across runs, the plan index's sha224 column
+    keeps them instead. Misses are read concurrently, since the time goes to
+    waiting on cloud downloads; the first failure is raised with file_sha224's
+    diagnostics.
+    """
+    keys = [(pth, stat.st_size, stat.st_mtime_ns) for pth, stat in zip(pths, stats)]
+    if len(keys) < 2:
+        return [_sha224_of_version(*key) for key in keys]
+    with ThreadPoolExecutor(max_workers=min(workers, len(keys))) as executor:
+        return list(executor.map(lambda key: _sha224_of_version(*key), keys))
+
+
 def get_default_stat_paths():
     """Return default paths to search for STAT plans."""
     plan_path = [
@@ -65,28 +96,231 @@ def get_default_stat_paths():
     return plan_path
 
 
-def get_plans(student_name, pths=get_default_stat_paths()):
+DEFAULT_INDEX = os.path.join(
+    os.path.expanduser("~"), ".cache", "findplan", "plans.sqlite"
+)
+PRUNE = {"courseHistories"}  # not plans; used to make new plans
+
+
+def open_plan_index(index_path):
+    """Open (creating if needed) the SQLite index of plan files under the search roots."""
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY, parent TEXT, root TEXT, mtime_ns INTEGER);
+        CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+        CREATE TABLE IF NOT EXISTS plans (
+            path TEXT PRIMARY KEY, dir TEXT, root TEXT, name TEXT,
+            mtime_ns INTEGER, size INTEGER, sha224 TEXT);
+        CREATE INDEX IF NOT EXISTS plans_name ON plans (root, name);
+        CREATE INDEX IF NOT EXISTS plans_dir ON plans (dir);
+        """)
+    return conn
+
+
+def _forget_tree(conn, directory):
+    """Remove a directory and everything indexed beneath it."""
+    # Range on the separator rather than LIKE, since '_' is common in names
+    below = (directory + os.sep, directory + chr(ord(os.sep) + 1))
+    conn.execute(
+        "DELETE FROM dirs WHERE path = ? OR (path > ? AND path < ?)",
+        (directory, *below),
+    )
+    conn.execute(
+        "DELETE FROM plans WHERE dir = ? OR (dir > ? AND dir < ?)", (directory, *below)
+    )
+
+
+def refresh_plan_index(conn, roots):
     """
-    Return DataFrame of unique plans given student_name.
+    Bring the index up to date with the plan files under roots.
 
-    Recursively search all paths in pths. Sort with most recent mtime first.
+    Each indexed directory costs one stat. Symbolic links to directories are
+    followed, as glob does, without looping. Only directories whose mtime changed,
+    meaning entries were added, removed or renamed, are listed again; files edited
+    in place are caught when a query matches them (see query_plan_index).
+    """
+    stack = [(root, root, None) for root in reversed(roots)]
+    visited = set()  # directory_key: a directory linked twice is indexed once
+    while stack:
+        directory, root, parent = stack.pop()
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            _forget_tree(conn, directory)
+            continue
+        key = directory_key(directory, stat)
+        if key in visited:
+            continue
+        visited.add(key)
+        mtime_ns = stat.st_mtime_ns
+        row = conn.execute(
+            "SELECT mtime_ns FROM dirs WHERE path = ? AND root = ?", (directory, root)
+        ).fetchone()
+        known_subdirs = [
+            path
+            for (path,) in conn.execute(
+                "SELECT path FROM dirs WHERE parent = ? AND root = ?", (directory, root)
+            )
+        ]
+        if row and row[0] == mtime_ns:  # listing unchanged
+            stack.extend((d, root, directory) for d in reversed(known_subdirs))
+            continue
+
+        subdirs, files = [], {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue  # hidden, as glob
+                    if entry.is_dir():  # following links, as glob
+                        if entry.name not in PRUNE:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(".txt"):
+                        files[entry.path] = entry.stat()
+        except OSError:
+            _forget_tree(conn, directory)
+            continue
+
+        for gone in set(known_subdirs) - set(subdirs):
+            _forget_tree(conn, gone)
+        conn.execute(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+            (directory, parent, root, mtime_ns),
+        )
+        indexed = {
+            path: (mtime, size)
+            for path, mtime, size in conn.execute(
+                "SELECT path, mtime_ns, size FROM plans WHERE dir = ?", (directory,)
+            )
+        }
+        for gone in indexed.keys() - files.keys():
+            conn.execute("DELETE FROM plans WHERE path = ?", (gone,))
+        for path, stat in files.items():
+            if indexed.get(path) != (stat.st_mtime_ns, stat.st_size):
+                conn.execute(
+                    "INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                    (
+                        path,
+                        directory,
+                        root,
+                        os.path.normcase(os.path.basename(path)),
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                    ),
+                )
+        stack.extend((d, root, directory) for d in reversed(subdirs))
+    conn.commit()
+
+
+def query_plan_index(conn, roots, student_name):
+    """
+    Return [(path, mtime, sha224)] for indexed plans matching student_name*.txt.
+
+    Uses an index range scan on the file name prefix. Matches are re-statted, and
+    hashed only if new or changed since they were last hashed.
+    """
+    prefix = os.path.normcase(student_name)
+    pattern = os.path.normcase(f"{student_name}*.txt")
+    matches = []  # (path, stat, sha224 or None if it must be recomputed)
+    for root in roots:
+        rows = conn.execute(
+            "SELECT path, name, mtime_ns, size, sha224 FROM plans "
+            "WHERE root = ? AND name >= ? AND name < ?",
+            (root, prefix, prefix + "\U0010ffff"),
+        ).fetchall()
+        for path, name, mtime_ns, size, sha224 in rows:
+            if not fnmatch.fnmatchcase(name, pattern) or "courseHistories" in path:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # removed since the refresh
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                sha224 = None
+            matches.append((path, stat, sha224))
+
+    stale = [(path, stat) for path, stat, sha224 in matches if sha224 is None]
+    hashes = {}
+    if stale:
+        stale_paths, stale_stats = zip(*stale)
+        hashes = dict(zip(stale_paths, file_sha224_many(stale_paths, stale_stats)))
+    for path, stat in stale:
+        conn.execute(
+            "UPDATE plans SET mtime_ns = ?, size = ?, sha224 = ? WHERE path = ?",
+            (stat.st_mtime_ns, stat.st_size, hashes[path], path),
+        )
+    conn.commit()
+    return [
+        (path, stat.st_mtime, sha224 or hashes[path]) for path, stat, sha224 in matches
+    ]
+
+
+def get_plans_many(
+    student_names, pths=get_default_stat_paths(), index_path=DEFAULT_INDEX
+):
     """
-    found_plan = []
+    Return {student_name: DataFrame as from get_plans} for several students.
+
+    The plan trees are scanned, or the index refreshed, only once for all names.
+    """
+    roots = []
     for pth in pths:
         if os.path.isdir(pth):
-            found_plan += glob(f"{pth}/**/{student_name}*.txt", recursive=True)
+            roots.append(pth)
         else:
             warn(f"Directory not found: {pth}")
-    found_plan = [p for p in found_plan if "courseHistories" not in p]
 
+    if index_path:
+        with contextlib.closing(open_plan_index(index_path)) as conn:
+            refresh_plan_index(conn, roots)
+            found = {
+                name: query_plan_index(conn, roots, name) for name in student_names
+            }
+    else:
+        # A single name can be matched while scanning, saving stats of other files
+        scanned = [
+            (path, stat)
+            for root_found in scan_roots(
+                roots,
+                f"{student_names[0]}*.txt" if len(student_names) == 1 else "*.txt",
+                prune=PRUNE,
+                skip_hidden=True,  # as glob
+                workers=len(roots),
+            )
+            for path, stat in root_found
+            if "courseHistories" not in path
+        ]
+        found = {}
+        for name in student_names:
+            pattern = os.path.normcase(f"{name}*.txt")
+            matched = [
+                (path, stat)
+                for path, stat in scanned
+                if fnmatch.fnmatchcase(
+                    os.path.normcase(os.path.basename(path)), pattern
+                )
+            ]
+            found[name] = []
+            if matched:
+                paths, stats = zip(*matched)
+                hashes = file_sha224_many(paths, stats)
+                found[name] = [
+                    (p, st.st_mtime, h) for p, st, h in zip(paths, stats, hashes)
+                ]
+
+    return {name: _plans_frame(found[name]) for name in student_names}
+
+
+def _plans_frame(found):
+    """Build the get_plans DataFrame from (path, mtime, sha224) tuples."""
     # Create DataFrame with all plan information
     data_frame = pd.DataFrame(
         {
-            "path": found_plan,
-            "mtime": pd.to_datetime(
-                [int(os.path.getmtime(pth)) for pth in found_plan], unit="s"
-            ),
-            "sha224": ["…" + file_sha224(pth) for pth in found_plan],
+            "path": [path for path, _, _ in found],
+            "mtime": pd.to_datetime([int(mtime) for _, mtime, _ in found], unit="s"),
+            "sha224": ["…" + sha224 for _, _, sha224 in found],
         }
     )
 
@@ -101,6 +335,17 @@ def get_plans(student_name, pths=get_default_stat_paths()):
     return data_frame
 
 
+def get_plans(student_name, pths=get_default_stat_paths(), index_path=DEFAULT_INDEX):
+    """
+    Return DataFrame of unique plans given student_name.
+
+    Recursively search all paths in pths. Sort with most recent mtime first.
+    With index_path (the default), answer from a persistent index of the plan
+    trees, refreshed incrementally; with None, scan the trees directly.
+    """
+    return get_plans_many([student_name], pths, index_path)[student_name]
+
+
 def extract_and_remove_fields(df, fields):
     """
     Extract fields with identical values.
@@ -148,113 +393,199 @@ STATUS_CATEGORIES = [
 ]
 
 
-def read_stat_plan(fn):
+STAT_COLUMNS = [
+    "ID",
+    "Year",
+    "Term",
+    "Prefix_Number",
+    "Credits",
+    "Status",
+    "Course Name",
+    "Last Name",
+    "First Name",
+    "Major",
+    "Current Standing",
+    "Email",
+    "UNKNOWN 1",
+    "Minor",
+    "UNKNOWN 2",
+    "UNKNOWN 3",
+    "UNKNOWN 4",
+    "Advisor 1",
+    "Advisor 2",
+    "UNKNOWN 5",
+    "UNKNOWN 6",
+    "Requirement",
+]
+
+STAT_STUDENT_FIELDS = [
+    "ID",
+    "Last Name",
+    "First Name",
+    "Major",
+    "Current Standing",
+    "Email",
+    "Minor",
+    "Advisor 1",
+    "Advisor 2",
+    "UNKNOWN 1",
+    "UNKNOWN 2",
+    "UNKNOWN 3",
+    "UNKNOWN 4",
+    "UNKNOWN 5",
+    "UNKNOWN 6",
+]
+
+STAT_DTYPES = {
+    "Status": pd.CategoricalDtype(STATUS_CATEGORIES),
+    **{f: "string" for f in ["Prefix_Number", "Course Name", "Requirement"]},
+}
+
+
+class CommentFilter:
     """
-    Return DataFrame & calculate credits completed & WIP given STAT plan path.
+    Read-only text file wrapper that drops STAT comment lines as it is read.
 
-    Doesn't include unsuccessful, NoCredit, or missing courses. Calculates
-    semester credits and raises an error if various sequenece rules are violated
-    (e.g., a course is planned in a past semester).
+    read_csv supports 1 comment character, but STAT plans have 2 ('<' and '>'),
+    so lines starting with either are skipped here, a chunk at a time, rather
+    than by copying the filtered file into memory first.
+    """
+
+    def __init__(self, file):
+        self._lines = (
+            line for line in file if not line.lstrip().startswith(("<", ">"))
+        )
+        self._pending = ""
+
+    def read(self, size=-1):
+        """Return up to size characters (all if negative) of the filtered text."""
+        if size is None or size < 0:
+            text, self._pending = self._pending + "".join(self._lines), ""
+            return text
+        chunk, length = [self._pending], len(self._pending)
+        for line in self._lines:
+            chunk.append(line)
+            length += len(line)
+            if length >= size:
+                break
+        text = "".join(chunk)
+        text, self._pending = text[:size], text[size:]
+        return text
+
+    def __iter__(self):
+        if self._pending:
+            yield from self._pending.splitlines(keepends=True)
+            self._pending = ""
+        yield from self._lines
+
+
+def read_stat_table(fn):
+    """
+    Return DataFrame of every course row in a STAT plan, indexed by (Year, Term).
+
+    Student fields that must be identical in every row are checked and removed.
     """
-    # read_csv supports 1 comment character, but we have 2, so preprocess:
     with open(fn, "r", encoding="utf-8") as file:
-        filtered_lines = [
-            line for line in file if not line.strip().startswith(("<", ">"))
-        ]
-    buffer = StringIO("".join(filtered_lines))  # convert to file-like object
-
-    plan = pd.read_csv(
-        buffer,
-        sep="\t",
-        skiprows=1,
-        index_col=["Year", "Term"],
-        names=[
-            "ID",
-            "Year",
-            "Term",
-            "Prefix_Number",
-            "Credits",
-            "Status",
-            "Course Name",
-            "Last Name",
-            "First Name",
-            "Major",
-            "Current Standing",
-            "Email",
-            "UNKNOWN 1",
-            "Minor",
-            "UNKNOWN 2",
-            "UNKNOWN 3",
-            "UNKNOWN 4",
-            "Advisor 1",
-            "Advisor 2",
-            "UNKNOWN 5",
-            "UNKNOWN 6",
-            "Requirement",
-        ],
-        dtype={
-            "Status": "category",
-            **{f: "string" for f in ["Prefix_Number", "Course Name", "Requirement"]},
-        },
-    )
+        plan = pd.read_csv(
+            CommentFilter(file),
+            sep="\t",
+            skiprows=1,
+            index_col=["Year", "Term"],
+            names=STAT_COLUMNS,
+            dtype=STAT_DTYPES,
+        )
 
-    plan["Status"] = pd.Categorical(plan["Status"], categories=STATUS_CATEGORIES)
-    extra_values = set(plan["Status"].unique()) - set(STATUS_CATEGORIES)
-    if extra_values:  # set not empty, nan indicates something couldn't convert
+    if plan["Status"].isna().any():  # nan indicates something couldn't convert
         raise ValueError("Unrecognized Status category")  # too late to find nan source
 
-    _, plan = extract_and_remove_fields(
-        plan,
-        [
-            "ID",
-            "Last Name",
-            "First Name",
-            "Major",
-            "Current Standing",
-            "Email",
-            "Minor",
-            "Advisor 1",
-            "Advisor 2",
-            "UNKNOWN 1",
-            "UNKNOWN 2",
-            "UNKNOWN 3",
-            "UNKNOWN 4",
-            "UNKNOWN 5",
-            "UNKNOWN 6",
-        ],
-    )
+    _, plan = extract_and_remove_fields(plan, STAT_STUDENT_FIELDS)
+
+    return plan
+
+
+def load_stat_plan(fn):
+    """
+    Return DataFrame of earned and planned courses given STAT plan path.
+
+    Unsuccessful, NoCredit and missing courses are dropped, and the rest ordered by
+    term and course. Prefix and Number are split out of the course number, and
+    SemCredits gives each course's credits in semester credits (quarter courses,
+    with 2-letter prefixes, count 2/3). Nothing is printed; see read_stat_plan.
+    """
+    plan = read_stat_table(fn)
 
     # Break course number into parts
     plan["Prefix"] = plan["Prefix_Number"].str[:5].str.rstrip()
     plan["Number"] = plan["Prefix_Number"].str[5:]
-    plan.drop("Prefix_Number", axis=1, inplace=True)
-    plan = plan.sort_values(["Prefix", "Number"])  # 1st since less significant
-    plan = plan.sort_index(level=["Year", "Term"])
-
-    # Convert everything to semester credits
-    plan["SemCredits"] = plan.apply(
-        lambda row: (
-            row["Credits"]
-            if len(row["Prefix"]) == 3
-            else (2 / 3) * row["Credits"] if len(row["Prefix"]) == 2 else np.nan
-        ),
-        axis=1,
+
+    # Drop courses without earned credits, then order by term, course within term
+    plan = (
+        plan[~plan["Status"].isin(["unsuccessful", "NoCredit", "missing"])]
+        .drop(columns="Prefix_Number")
+        .sort_values(["Year", "Term", "Prefix", "Number"], kind="stable")
     )
 
-    plan = plan[
-        ~plan["Status"].isin(["unsuccessful", "NoCredit", "missing"])
-    ]  # not earned credits
+    # Convert everything to semester credits (3-letter prefix: semester courses)
+    prefix_len = plan["Prefix"].str.len().fillna(0).to_numpy()
+    credits = plan["Credits"].to_numpy(dtype="float64")
+    plan["SemCredits"] = np.select(
+        [prefix_len == 3, prefix_len == 2], [credits, (2 / 3) * credits], np.nan
+    )
 
     for k in ["Credits", "SemCredits"]:
         if np.all(plan[k] % 1 == 0):
             plan[k] = plan[k].astype("int32")
 
+    return plan
+
+
+def summarize_credits(plan):
+    """
+    Return credit totals and milestones for a plan from load_stat_plan.
+
+    Returns a dict with "credits" and "last_term", each a dict keyed by status
+    ("successful", "wip"); "by_term", a DataFrame of credits earned per term with a
+    running total; and "senior_term", the term after which senior standing (90
+    semester credits) will be reached, or None.
+    """
     idx, sem_credits, last_term = {}, {}, {}
     for k in ["successful", "wip"]:
         idx[k] = plan["Status"] == k
         sem_credits[k] = plan.loc[idx[k], "SemCredits"].sum()
         last_term[k] = sem_tup_str(plan[idx[k]].index[-1]) if any(idx[k]) else None
 
+    earned_credits_term = (
+        plan.groupby(["Year", "Term"])
+        .agg({"Credits": "sum", "SemCredits": "sum"})
+        .reset_index()
+    )
+    earned_credits_term["TotalSemCredits"] = earned_credits_term["SemCredits"].cumsum()
+    senior_term = None
+    if sem_credits["wip"] < 90:
+        senior_terms = earned_credits_term[earned_credits_term["TotalSemCredits"] >= 90]
+        if not senior_terms.empty:
+            senior_term = sem_tup_str(senior_terms.iloc[0][["Year", "Term"]].tolist())
+
+    return {
+        "credits": sem_credits,
+        "last_term": last_term,
+        "by_term": earned_credits_term,
+        "senior_term": senior_term,
+    }
+
+
+def read_stat_plan(fn):
+    """
+    Return DataFrame & calculate credits completed & WIP given STAT plan path.
+
+    Doesn't include unsuccessful, NoCredit, or missing courses. Calculates
+    semester credits and raises an error if various sequenece rules are violated
+    (e.g., a course is planned in a past semester).
+    """
+    plan = load_stat_plan(fn)
+    summary = summarize_credits(plan)
+    sem_credits, last_term = summary["credits"], summary["last_term"]
+
     print(
         f"{sem_credits['successful']:.2f} credits are complete as of {last_term['successful']}"
     )
@@ -266,27 +597,99 @@ def read_stat_plan(fn):
     else:
         print("There is no WIP.")
 
-    earned_credits_term = (
-        plan.groupby(["Year", "Term"])
-        .agg({"Credits": "sum", "SemCredits": "sum"})
-        .reset_index()
-    )
-    earned_credits_term["TotalSemCredits"] = earned_credits_term["SemCredits"].cumsum()
-    print(earned_credits_term.to_string(index=False))
-    if sem_credits["wip"] < 90:
-        senior_terms = earned_credits_term[earned_credits_term["TotalSemCredits"] >= 90]
-        if not senior_terms.empty:
-            print(
-                "Senior standing will be reached after "
-                f"{sem_tup_str(senior_terms.iloc[0][['Year', 'Term']].tolist())}"
-            )
+    print(summary["by_term"].to_string(index=False))
+    if summary["senior_term"]:
+        print(f"Senior standing will be reached after {summary['senior_term']}")
 
     return plan
 
 
+def summarize_stat_plan(fn):
+    """Return one batch-table row of credits and milestones for a STAT plan path."""
+    summary = summarize_credits(load_stat_plan(fn))
+    return {
+        "Successful Credits": summary["credits"]["successful"],
+        "Successful Through": summary["last_term"]["successful"],
+        "WIP Credits": summary["credits"]["wip"],
+        "WIP Through": summary["last_term"]["wip"],
+        "Senior Standing After": summary["senior_term"],
+    }
+
+
+def try_summarize_stat_plan(fn):
+    """Return (row, None) from summarize_stat_plan, or (None, error message)."""
+    try:
+        return summarize_stat_plan(fn), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def read_names(source):
+    """Return student names, one per line, from a file or '-' for stdin."""
+    with contextlib.ExitStack() as stack:
+        file = (
+            sys.stdin
+            if source == "-"
+            else stack.enter_context(open(source, "r", encoding="utf-8"))
+        )
+        names = [line.strip() for line in file]
+    return [name for name in names if name and not name.startswith("#")]
+
+
+def summarize_cohort(names, pths, index_path=DEFAULT_INDEX, jobs=None):
+    """
+    Return a DataFrame summarizing the most recent STAT plan of each named student.
+
+    The plan trees are scanned (or the index refreshed) once for all names, and the
+    selected plans are read in a pool of jobs processes. Students without a plan,
+    or whose plan cannot be read, get an explanatory Error instead of figures.
+    """
+    plans = get_plans_many(names, pths, index_path)
+    selected = {name: df.at[0, "path"] for name, df in plans.items() if not df.empty}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = dict(
+            zip(selected, executor.map(try_summarize_stat_plan, selected.values()))
+        )
+
+    rows = []
+    for name in names:
+        row = {"Name": name, "Plan": selected.get(name)}
+        if name not in selected:
+            row["Error"] = "No plans found"
+        else:
+            summary, error = results[name]
+            row.update(summary or {"Error": error})
+        rows.append(row)
+    columns = ["Name", "Plan", "Successful Credits", "Successful Through"]
+    columns += ["WIP Credits", "WIP Through", "Senior Standing After", "Error"]
+    return pd.DataFrame(rows).reindex(columns=columns)
+
+
+def batch_main(args):
+    """Summarize the most recent plan of every student listed in args.batch."""
+    names = read_names(args.batch)
+    cohort = summarize_cohort(
+        names, args.directory, None if args.no_index else args.index, args.jobs
+    )
+    pd.options.display.max_colwidth = None
+    print(cohort.to_string(index=False))
+    if args.output:
+        if args.output.endswith(".xlsx"):
+            cohort.to_excel(args.output, index=False, freeze_panes=(1, 0))
+        else:
+            cohort.to_csv(args.output, index=False)
+        print(f"Summary written to {args.output}")
+    return 0 if cohort["Error"].isna().all() else -1
+
+
 def main(args):
     """Find matching advising plans, copy user selection to clipboard."""
-    data_frame = get_plans(args.name, args.directory)
+    if args.batch:
+        return batch_main(args)
+
+    data_frame = get_plans(
+        args.name, args.directory, None if args.no_index else args.index
+    )
 
     if data_frame.empty:
         print("No plans found, exiting...")
@@ -315,7 +718,25 @@ if __name__ == "__main__":
         description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument(
-        "name", type=str, help="LastName | LastName_FirstInit | LastName_FirstName"
+        "name",
+        type=str,
+        nargs="?",
+        help="LastName | LastName_FirstInit | LastName_FirstName",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        type=str,
+        help="File of names, one per line ('-' for stdin), to summarize together",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Worker processes for reading plans in batch mode (default: CPUs)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="Batch summary file (.csv or .xlsx)"
     )
     parser.add_argument(
         "-d",
@@ -330,4 +751,17 @@ if __name__ == "__main__":
     parser.add_argument(
         "-c", "--choose", action="store_true", help="Choose plan interactively"
     )
-    main(parser.parse_args())
+    parser.add_argument(
+        "--index", type=str, default=DEFAULT_INDEX, help="Plan index database"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Scan the directories instead of using the index",
+    )
+    cli_args = parser.parse_args()
+    if (cli_args.name is None) == (cli_args.batch is None):
+        parser.error("Give either a name or -b/--batch")
+    if cli_args.jobs is not None and cli_args.jobs < 1:
+        parser.error(f"Number of jobs ({cli_args.jobs}) must be at least 1")
+    main(cli_args)
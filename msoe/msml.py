@@ -11,54 +11,138 @@ Given the XLSX master file for MSML course planning, do one of the following.
 
 import argparse
 import contextlib
+import datetime
+import hashlib
+import json
 import os
 import pprint
 import re
 import shutil
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+from warnings import warn
 
 import numpy as np
 import pandas as pd
 import pyperclip
 
-from findplan import get_plans, read_stat_plan
+from findplan import (
+    get_default_stat_paths,
+    get_plans,
+    get_plans_many,
+    load_stat_plan,
+    read_stat_plan,
+)
+
+
+def open_shared(path):
+    """
+    Open path for binary reading, letting other processes read, write or delete it.
+
+    On Windows the file is opened with every share mode, which succeeds against
+    sync clients that hold it open for writing; elsewhere this is open(path, "rb").
+    """
+    if os.name != "nt":
+        return open(path, "rb")
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    create_file = ctypes.windll.kernel32.CreateFileW
+    create_file.restype = wintypes.HANDLE
+    generic_read, share_all, open_existing = 0x80000000, 0x7, 3
+    handle = create_file(path, generic_read, share_all, None, open_existing, 0, None)
+    if handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError()
+    return os.fdopen(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), "rb")
 
 
 def check_file_accessibility(filename):
     """Check if the file is accessible for reading."""
     try:
-        with open(filename, "rb"):
+        with open_shared(filename):
             return True
     except OSError:  # PermissionError is the common raised subclass
         return False
 
 
+def copy_shared(source_path, target_path):
+    """Copy a file opened with open_shared, keeping its mtime (as shutil.copy2)."""
+    with open_shared(source_path) as source, open(target_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    shutil.copystat(source_path, target_path)
+
+
 @contextlib.contextmanager
-def safe_file_access(source_path):
-    """Context manager to access file with fallback to temporary copy if the original is locked."""
-    temp_file_used = False
-    temp_file_path = None
+def safe_file_access(source_path, snapshot_dir=None):
+    """
+    Context manager to access file with fallback to a copy if the original is locked.
 
-    if check_file_accessibility(source_path):
-        print("File is accessible for reading.")
-        yield source_path
-    else:
-        print("File is not accessible. Assuming OneDrive lock.")
+    With snapshot_dir, the copy is kept there and reused while its size and mtime
+    match the original, so a locked file is copied only when it has changed;
+    otherwise the copy is temporary. The time spent in each step is reported.
+    """
+    timings = []
+
+    def timed(step, func, *args):
+        start = time.perf_counter()
         try:
+            return func(*args)
+        finally:
+            timings.append(f"{step} {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    temp_file_path = None
+    try:
+        if timed("open", check_file_accessibility, source_path):
+            print("File is accessible for reading.")
+            accessible_file_path = source_path
+        elif snapshot_dir is not None:
+            print("File is not accessible. Assuming OneDrive lock.")
+            accessible_file_path = _cache_path(snapshot_dir, source_path, ".xlsx")
+
+            def is_current():
+                if not os.path.exists(accessible_file_path):
+                    return False
+                source, snapshot = os.stat(source_path), os.stat(accessible_file_path)
+                return (source.st_size, source.st_mtime_ns) == (
+                    snapshot.st_size,
+                    snapshot.st_mtime_ns,
+                )
+
+            if timed("snapshot check", is_current):
+                print(f"Reusing snapshot at {accessible_file_path}.")
+            else:
+                os.makedirs(snapshot_dir, exist_ok=True)
+                timed(
+                    "copy",
+                    _replace_atomically,
+                    accessible_file_path,
+                    lambda path: copy_shared(source_path, path),
+                )
+                print(f"Snapshot created at {accessible_file_path} due to file lock.")
+        else:
+            print("File is not accessible. Assuming OneDrive lock.")
             fd, temp_file_path = tempfile.mkstemp()  # Create a temporary file
-            os.close(fd)  # Close the file descriptor, copy2 will open it again
-            shutil.copy2(source_path, temp_file_path)
+            os.close(fd)  # Close the file descriptor, the copy will open it again
+            timed("copy", copy_shared, source_path, temp_file_path)
             print(f"Local copy created at {temp_file_path} due to file lock.")
-            temp_file_used = True
-            yield temp_file_path
-        except IOError:
-            print("Error while creating a local copy.")
-            raise  # re-raise, fatal error
+            accessible_file_path = temp_file_path
+    except IOError:
+        print("Error while creating a local copy.")
+        if temp_file_path:
+            os.remove(temp_file_path)
+        raise  # re-raise, fatal error
+    finally:
+        print(f"File access: {', '.join(timings)}")
 
-    if temp_file_used:  # Cleanup if temporary file was used
-        os.remove(temp_file_path)
-        print("Temporary local copy removed successfully.")
+    try:
+        yield accessible_file_path
+    finally:
+        if temp_file_path:  # Cleanup if temporary file was used
+            os.remove(temp_file_path)
+            print("Temporary local copy removed successfully.")
 
 
 TERMS = {1: "Fall", 2: "Spring", 3: "Summer"}
@@ -110,13 +194,19 @@ def make_electives_unique(li):
             li[i] = crs + " " + str(j)
 
 
+CORE_COURSES = ["CSC6621", "CSC6605", "PHL6001", "CSC7901"]
+CSC5201_OPTIONS = ["CSC5201", "CSC6711", "CSC6712"]  # any one meets CSC5201
+CSC5610_BUS = ["BUS6121", "BUS6131"]  # together meet CSC5610
+APPROVED_ELECTIVES = ["BUS6141"]  # don't fit into course number logic
+
+
 def get_requirements(class_list, need_csc5610, need_mth5810):
     """
     Provide a reconciliation of how and whether the degree requirements are met.
 
     Inputs are dict of semester course plans and needed topic flags from admission decision.
     """
-    requirements = ["CSC5201", "CSC6621", "CSC6605", "PHL6001", "CSC7901", "CSC5xxx"]
+    requirements = ["CSC5201", *CORE_COURSES, "CSC5xxx"]
     if need_csc5610:
         requirements.insert(0, "CSC5610")
     else:
@@ -131,7 +221,7 @@ def get_requirements(class_list, need_csc5610, need_mth5810):
     reqs = {}
 
     # Special case CSC5201, which can be met by any of 3 classes
-    for opt in ["CSC5201", "CSC6711", "CSC6712"]:
+    for opt in CSC5201_OPTIONS:
         if opt in planned:
             reqs["CSC5201"] = opt
             requirements.remove("CSC5201")
@@ -139,19 +229,15 @@ def get_requirements(class_list, need_csc5610, need_mth5810):
             break
 
     # Special case CSC5610, which can also be met by BUS6121+BUS6131
-    csc5610bus = ["BUS6121", "BUS6131"]
-    if "CSC5610" in requirements and all(opt in planned for opt in csc5610bus):
-        reqs["CSC5610"] = csc5610bus
+    if "CSC5610" in requirements and all(opt in planned for opt in CSC5610_BUS):
+        reqs["CSC5610"] = CSC5610_BUS
         requirements.remove("CSC5610")
-        planned = [x for x in planned if x not in csc5610bus]
+        planned = [x for x in planned if x not in CSC5610_BUS]
 
-    electives = [
-        "BUS6141"
-    ]  # Approved electives that don't fit into course number logic
     for crs in requirements.copy():
         if crs.startswith("CSC5xxx"):
             for opt in planned:
-                if (opt in electives) or (
+                if (opt in APPROVED_ELECTIVES) or (
                     opt.startswith(("BME", "CSC"))
                     and opt[3].isdigit()
                     and int(opt[3]) >= 5
@@ -174,6 +260,72 @@ def get_requirements(class_list, need_csc5610, need_mth5810):
     return reqs
 
 
+def is_elective(courses):
+    """Return boolean array of which course codes (a pandas Index) meet CSC5xxx."""
+    first_digit = courses.str[3]
+    return courses.isin(APPROVED_ELECTIVES) | (
+        courses.str.startswith(("BME", "CSC"))
+        & first_digit.str.isdigit()
+        & (first_digit >= "5")
+    )
+
+
+def audit_requirements(df, enrolled):
+    """
+    Return DataFrame of every student's requirements, True where unmet by the plan.
+
+    Gives the same result as get_requirements for each student at once, from
+    counts of planned courses per student (enrolled is build_enrollments(df)).
+    The greedy matching reduces to counting: specific requirements consume
+    their own course, and the CSC5xxx electives are met in order by whatever
+    eligible courses remain. A final Unmet column lists the unmet ones.
+    """
+    counts = pd.crosstab(enrolled["Row"], enrolled["Course"].astype(str))
+    counts = counts.reindex(index=range(len(df)), fill_value=0)
+
+    def planned(courses):
+        return counts.reindex(columns=courses, fill_value=0).to_numpy() > 0
+
+    need_csc5610 = df["CSC5610 Needed?"].fillna(False).to_numpy(dtype=bool)
+    need_mth5810 = df["MTH5810 Needed?"].fillna(False).to_numpy(dtype=bool)
+    has_csc5201 = planned(CSC5201_OPTIONS).any(axis=1)
+    has_csc5610 = planned(["CSC5610"])[:, 0]
+    has_bus = planned(CSC5610_BUS).all(axis=1)
+    has_core = planned(CORE_COURSES)
+
+    unmet = {"CSC5610": need_csc5610 & ~has_csc5610 & ~has_bus}
+    unmet["CSC5201"] = ~has_csc5201
+    unmet.update(zip(CORE_COURSES, ~has_core.T))
+
+    # Eligible courses left once the specific requirements took theirs
+    available = counts.loc[:, is_elective(counts.columns)].sum(axis=1).to_numpy()
+    available = available - has_csc5201 - (need_csc5610 & has_csc5610 & ~has_bus)
+    available = available - has_core[:, is_elective(pd.Index(CORE_COURSES))].sum(axis=1)
+    n_electives = 1 + ~need_csc5610 + ~need_mth5810
+    for j in range(1, 4):
+        unmet[f"CSC5xxx {j}"] = (n_electives >= j) & (available < j)
+    unmet["MTH5810"] = need_mth5810 & ~planned(["MTH5810"])[:, 0]
+
+    audit = pd.DataFrame(unmet, index=df.index)
+    audit.insert(0, "First Name", df["First Name"])
+    audit["Unmet"] = [
+        ", ".join(audit.columns[1:][row]) for row in audit.iloc[:, 1:].to_numpy()
+    ]
+    return audit
+
+
+def summarize_audit(args, df, enrolled):
+    """List every student with unmet requirements and write the full audit."""
+    audit = audit_requirements(df, enrolled)
+    unmet = audit.loc[audit["Unmet"] != "", ["First Name", "Unmet"]]
+    print(unmet.to_string())
+    print(f"{len(unmet)} of {len(audit)} students have unmet requirements")
+    output = args.output or "audit.xlsx"
+    audit.to_excel(output, sheet_name="Audit", freeze_panes=(1, 2))
+    print(f"Audit written to {output}")
+    return 0
+
+
 def extract_grad_plan(plan):
     """Given a DataFrame with the student's entire STAT plan, extract the graduate portion."""
     grad_plan = plan[
@@ -228,29 +380,262 @@ def summarize_student(args, df):
     return 0
 
 
-def summarize_course(args, df):
-    """Given a course code, list MSML students planning to take it."""
-    results = []
-
-    # Iterate over columns containing each semester's course selections
-    for col in df.columns[df.columns.str.contains(r"\dS\d{2} C\d")]:
-        # Check if any cell in the column contains the course code
-        matching_rows = df[df[col].astype(str).str.contains(args.name, na=False)]
-        term = col.split(" ", 1)[0]
-        # Append the results list with student name and term details
-        for _, row in matching_rows.iterrows():
-            results.append(
+def stat_term_code(year, term):
+    """Convert a STAT (Year, Term), like (2024, 'S1'), to a term code like 1S24."""
+    return f"{term[1:]}S{int(year) % 100:02d}"
+
+
+def load_grad_plan(path):
+    """Return (graduate portion of the STAT plan at path, None) or (None, error)."""
+    try:
+        return extract_grad_plan(load_stat_plan(path)), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _term_order(terms):
+    """Return sortable keys for a Series of term codes: year, then semester."""
+    return terms.str[2:] + terms.str[0]
+
+
+def _pair(master, stat, on):
+    """
+    Pair master file and STAT rows (with ids MID, SID) that agree on columns on.
+
+    Repeats pair up in term order. Return the pairs and the unpaired rows of each.
+    """
+
+    def numbered(frame):
+        frame = frame.assign(Order=_term_order(frame["Term"]))
+        frame = frame.sort_values([*on, "Order"], kind="stable")
+        return frame.assign(Occurrence=frame.groupby(on).cumcount())
+
+    pairs = numbered(master).merge(
+        numbered(stat), on=[*on, "Occurrence"], suffixes=(" MSML", " STAT")
+    )
+    if "Term" in on:
+        pairs["Term MSML"] = pairs["Term STAT"] = pairs["Term"]
+    return (
+        pairs,
+        master[~master["MID"].isin(pairs["MID"])],
+        stat[~stat["SID"].isin(pairs["SID"])],
+    )
+
+
+def _pair_placeholders(master, stat, same_term):
+    """
+    Pair master file placeholders like CSC5xxx with fitting STAT courses, as _pair.
+
+    Placeholders pair in the order given, each with the earliest fitting STAT
+    course (in its own term with same_term). Paired rows' Course shows both.
+    """
+    candidates = master[master["Course"].str.contains("x")].merge(
+        stat, on="Row", suffixes=(" MSML", " STAT")
+    )
+    candidates = candidates[
+        np.array(
+            [
+                bool(re.fullmatch(course_pattern(code), course))
+                and (not same_term or master_term == stat_term)
+                for code, course, master_term, stat_term in zip(
+                    candidates["Course MSML"],
+                    candidates["Course STAT"],
+                    candidates["Term MSML"],
+                    candidates["Term STAT"],
+                )
+            ],
+            dtype=bool,
+        )
+    ]
+    candidates = candidates.assign(Order=_term_order(candidates["Term STAT"]))
+    candidates = candidates.sort_values(["MID", "Order"], kind="stable")
+    used_mid, used_sid, pairs = set(), set(), []
+    for i, mid, sid in zip(candidates.index, candidates["MID"], candidates["SID"]):
+        if mid not in used_mid and sid not in used_sid:
+            used_mid.add(mid)
+            used_sid.add(sid)
+            pairs.append(i)
+    pairs = candidates.loc[pairs]
+    pairs = pairs.assign(
+        Course=pairs["Course MSML"] + " (" + pairs["Course STAT"] + ")"
+    )
+    return (
+        pairs,
+        master[~master["MID"].isin(used_mid)],
+        stat[~stat["SID"].isin(used_sid)],
+    )
+
+
+def reconcile_plans(df, enrolled, pths=get_default_stat_paths(), jobs=None):
+    """
+    Return DataFrame of disagreements between master file and STAT plans.
+
+    Each student's most recent STAT plan is found in one scan and the plans are
+    loaded in a pool of jobs processes. Graduate courses are paired by course
+    (a master file placeholder like CSC5xxx fits matching STAT courses),
+    preferring pairs in the same term. Each row reports a course
+    not in STAT, not in the master file, planned in different terms, or a
+    student without a readable STAT plan. STAT (2024, 'S1') is taken to be
+    the master file's 1S24.
+    """
+    names = [f"{last}_{first}" for last, first in df["First Name"].items()]
+    plans = get_plans_many(names, pths)
+    paths = {
+        row: plans[name].at[0, "path"]
+        for row, name in enumerate(names)
+        if not plans[name].empty
+    }
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        loaded = dict(zip(paths, executor.map(load_grad_plan, paths.values())))
+
+    problems = [
+        {"Row": row, "Issue": "No STAT plan"}
+        for row in range(len(df))
+        if row not in paths
+    ]
+    stat = []
+    for row, (grad_plan, error) in loaded.items():
+        if grad_plan is None:
+            problems.append({"Row": row, "Issue": f"STAT plan unreadable: {error}"})
+            continue
+        stat.append(
+            pd.DataFrame(
                 {
-                    "Last Name": row.name,
-                    "First Name": row["First Name"],
-                    "Year": term[2:],
-                    "Semester": term[0],
+                    "Row": row,
+                    "Course": (grad_plan["Prefix"] + grad_plan["Number"]).to_numpy(
+                        dtype=object
+                    ),
+                    "Term": [stat_term_code(*term) for term in grad_plan.index],
                 }
             )
+        )
+    stat = pd.concat(stat) if stat else pd.DataFrame(columns=["Row", "Course", "Term"])
+    stat = stat.astype({"Row": int, "Course": str, "Term": str})
+    master = enrolled.loc[
+        enrolled["Row"].isin(
+            [row for row, (plan, _) in loaded.items() if plan is not None]
+        ),
+        ["Row", "Course", "Term"],
+    ].astype({"Course": str, "Term": str})
+    master = master.assign(MID=range(len(master)))
+    stat = stat.assign(SID=range(len(stat)))
+
+    # Pair exactly, then placeholders (e.g., CSC5xxx) with fitting STAT courses,
+    # first within a term, then across terms
+    _, master, stat = _pair(master, stat, ["Row", "Course", "Term"])
+    _, master, stat = _pair_placeholders(master, stat, same_term=True)
+    other_term, master, stat = _pair(master, stat, ["Row", "Course"])
+    wild, master, stat = _pair_placeholders(master, stat, same_term=False)
+
+    paired = pd.concat([other_term, wild]).rename(
+        columns={"Term MSML": "MSML Term", "Term STAT": "STAT Term"}
+    )
+    paired = paired[paired["MSML Term"] != paired["STAT Term"]].assign(
+        Issue="Term differs"
+    )
+    problems = pd.concat(
+        [
+            pd.DataFrame(problems, columns=["Row", "Issue"]),
+            master.rename(columns={"Term": "MSML Term"}).assign(Issue="Not in STAT"),
+            stat.rename(columns={"Term": "STAT Term"}).assign(
+                Issue="Not in master file"
+            ),
+            paired,
+        ]
+    )
+    columns = ["Row", "Course", "MSML Term", "STAT Term", "Issue"]
+    report = problems[columns].sort_values(
+        ["Row", "Course"], na_position="first", kind="stable", ignore_index=True
+    )
+    report.insert(0, "Last Name", df.index[report["Row"].to_numpy(dtype=int)])
+    report.insert(1, "First Name", df["First Name"].iloc[report["Row"]].to_numpy())
+    return report.drop(columns="Row").reindex(
+        columns=["Last Name", "First Name", *columns[1:]]
+    )
+
 
-    if results:
-        cols = ["Year", "Semester", "Last Name", "First Name"]
-        enrolled = pd.DataFrame(results, columns=cols).sort_values(cols)
+def summarize_reconcile(args, df, enrolled):
+    """Reconcile every student's master file and STAT plans and write the report."""
+    report = reconcile_plans(df, enrolled, jobs=args.jobs)
+    print(report.to_string(index=False))
+    print(
+        f"{len(report)} disagreements for "
+        f"{report['Last Name'].nunique()} of {len(df)} students"
+    )
+    output = args.output or "reconcile.xlsx"
+    report.to_excel(output, index=False, sheet_name="Reconcile", freeze_panes=(1, 2))
+    print(f"Report written to {output}")
+    return 0
+
+
+SLOT_PATTERN = r"\dS\d{2} C\d"  # a term's course slot column, e.g., "1S24 C1"
+
+
+def build_enrollments(df):
+    """
+    Return the planned courses in df as one row per student, term and slot.
+
+    Columns are Course, Term, Year, Semester, Last Name, First Name and Row (the
+    student's position in df), with Course and Term categorical, so queries
+    match against the distinct values only. Build once per load of the master file.
+    """
+    slots = df.columns[df.columns.str.fullmatch(SLOT_PATTERN)]
+    enrolled = (
+        df[["First Name", *slots]]
+        .rename_axis("Last Name")
+        .reset_index()
+        .assign(Row=range(len(df)))
+        .melt(
+            id_vars=["Last Name", "First Name", "Row"],
+            value_vars=slots,
+            var_name="Slot",
+            value_name="Course",
+        )
+        .dropna(subset=["Course"])
+    )
+    term = enrolled["Slot"].str.split(" ", n=1).str[0]
+    return pd.DataFrame(
+        {
+            "Course": enrolled["Course"].astype(str).astype("category"),
+            "Term": term.astype("category"),
+            "Year": term.str[2:],
+            "Semester": term.str[0],
+            "Last Name": enrolled["Last Name"],
+            "First Name": enrolled["First Name"],
+            "Row": enrolled["Row"],
+        }
+    )
+
+
+def course_pattern(code):
+    """Return a regex for a course code; 'x' matches a digit or a literal 'x'."""
+    return "".join(r"[x\d]" if ch == "x" else re.escape(ch) for ch in code)
+
+
+def find_enrollments(enrolled, course=None, term=None):
+    """
+    Return the rows of build_enrollments matching a course and/or term code.
+
+    course may contain 'x' wildcards (e.g., CSC5xxx) and matches anywhere in a
+    planned course cell.
+    """
+    match = pd.Series(True, index=enrolled.index)
+    if course is not None:
+        categories = enrolled["Course"].cat.categories
+        wanted = categories[categories.str.contains(course_pattern(course))]
+        match &= enrolled["Course"].isin(wanted)
+    if term is not None:
+        match &= enrolled["Term"] == term
+    return enrolled[match]
+
+
+def summarize_course(args, enrolled):
+    """Given a course code, list MSML students planning to take it."""
+    cols = ["Year", "Semester", "Last Name", "First Name"]
+    matches = find_enrollments(enrolled, course=args.name)
+
+    if not matches.empty:
+        enrolled = matches[cols].sort_values(cols)
         print(enrolled.to_string(index=False))
 
         # Copy to clipboard for easy pasting to Excel
@@ -269,25 +654,20 @@ def summarize_course(args, df):
     return 0
 
 
-def summarize_term(args, df):
+def summarize_term(args, df, enrolled):
     """Given a term, list courses scheduled to run and students in each course."""
-    results = []
-
-    # Iterate over each column in the given term
-    for col in [f"{args.name} C{i}" for i in range(1, 4)]:
-        matching_rows = df[df[col].notna()]
-        for _, row in matching_rows.iterrows():
-            results.append(
-                {
-                    "Last Name": row.name,
-                    "First Name": row["First Name"],
-                    "Course": row[col],
-                    "BS Complete?": row["BS Complete?"],
-                    "BS Expected": row["BS Expected"],
-                }
-            )
-
-    grouped = pd.DataFrame(results)
+    matches = find_enrollments(enrolled, term=args.name)
+    if matches.empty:
+        print(f"Term not found: [{args.name}]")
+        return 0
+
+    # Bring along each student's BS status, by the student's row in df
+    bs_fields = ["BS Complete?", "BS Expected"]
+    bs_status = df[bs_fields].iloc[matches["Row"].to_numpy()]
+    grouped = matches[["Last Name", "First Name"]].assign(
+        Course=matches["Course"].astype(str),
+        **{field: bs_status[field].to_numpy() for field in bs_fields},
+    )
     grouped.sort_values(by=["Course", "Last Name", "First Name"], inplace=True)
     grouped.to_excel(
         args.name + ".xlsx", index=False, sheet_name=args.name, freeze_panes=(1, 0)
@@ -302,51 +682,280 @@ def summarize_term(args, df):
     return 0
 
 
-def main(args):
-    """Perform actions requested by command line arguments."""
-    # See https://github.com/pandas-dev/pandas/issues/45903 re loading bool as uint8
-    boolean_fields = [
-        "Early Entry Originally",
-        "BS Complete?",
-        "GPA < 3",
-        "HasLinearAlgebra",
-        "HasMultivariableCalculus",
-        "CSC5120 Needed?",
-        "CSC5610 Needed?",
-    ]
-    # "MTH5810 Needed?" is detected as boolean; adding it to the above list causes conversion error
-    int32_fields = ["ID Number", "#≥6000 before BS", "# Assigned"]
+def term_code_for_date(date):
+    """Return the term code in session (or next to start) on a date, e.g., 1S26 in Oct 2025."""
+    # Fall starts the academic year named for the next calendar year
+    if date.month >= 9:
+        return f"1S{(date.year + 1) % 100:02d}"
+    return f"{2 if date.month <= 5 else 3}S{date.year % 100:02d}"
+
 
-    with safe_file_access(args.file) as accessible_file_path:
+def seat_demand(enrolled, current_term):
+    """
+    Return (future, history): course × term DataFrames of planned seats.
+
+    Both come from one pivot of build_enrollments, with terms in chronological
+    order; future holds current_term and later, history the earlier terms.
+    Each has a Total column of seats per course across its terms.
+    """
+    demand = pd.crosstab(
+        enrolled["Course"].astype(str), enrolled["Term"].astype(str)
+    ).rename_axis(index="Course", columns="Term")
+    order = _term_order(demand.columns.to_series()).to_numpy()
+    demand = demand.iloc[:, np.argsort(order, kind="stable")]
+    is_future = np.sort(order) >= _term_order(pd.Series([current_term])).iloc[0]
+    future, history = demand.loc[:, is_future], demand.loc[:, ~is_future]
+    return tuple(
+        frame.assign(Total=frame.sum(axis=1)).query("Total > 0")
+        for frame in (future, history)
+    )
+
+
+def summarize_demand(args, enrolled):
+    """Write seat demand per course and term, future and history, in one file."""
+    current_term = args.current or term_code_for_date(datetime.date.today())
+    future, history = seat_demand(enrolled, current_term)
+    if future.empty:
+        print(f"No seats planned from {current_term}")
+    else:
+        print(f"Planned seats from {current_term}:")
+        print(future.to_string())
+
+    output = args.output or "demand.xlsx"
+    if output.endswith(".parquet"):
+        # One long table, since Parquet has no sheets
+        pd.concat(
+            [
+                frame.drop(columns="Total")
+                .stack()
+                .rename("Seats")
+                .reset_index()
+                .assign(Future=is_future)
+                for frame, is_future in ((history, False), (future, True))
+            ],
+            ignore_index=True,
+        ).query("Seats > 0").astype({"Seats": "int32"}).to_parquet(output, index=False)
+    else:
+        with pd.ExcelWriter(output) as writer:
+            future.to_excel(writer, sheet_name="Future", freeze_panes=(1, 1))
+            history.to_excel(writer, sheet_name="History", freeze_panes=(1, 1))
+    print(f"Demand written to {output}")
+    return 0
+
+
+# See https://github.com/pandas-dev/pandas/issues/45903 re loading bool as uint8
+BOOLEAN_FIELDS = [
+    "Early Entry Originally",
+    "BS Complete?",
+    "GPA < 3",
+    "HasLinearAlgebra",
+    "HasMultivariableCalculus",
+    "CSC5120 Needed?",
+    "CSC5610 Needed?",
+]
+# "MTH5810 Needed?" is detected as boolean; adding it to the above list causes conversion error
+INT32_FIELDS = ["ID Number", "#≥6000 before BS", "# Assigned"]
+
+
+def read_msml(path):
+    """
+    Return DataFrame of enrolled students' records from the master file, typed.
+
+    The file is read through open_shared, as safe_file_access checked it.
+    """
+    with open_shared(path) as file:
         df = pd.read_excel(
-            accessible_file_path,
+            file,
             index_col=0,
             dtype={
-                **{field: pd.UInt8Dtype() for field in boolean_fields},
-                **{field: pd.Int32Dtype() for field in int32_fields},
+                **{field: pd.UInt8Dtype() for field in BOOLEAN_FIELDS},
+                **{field: pd.Int32Dtype() for field in INT32_FIELDS},
             },
         )
 
-    for field in boolean_fields:
+    for field in BOOLEAN_FIELDS:
         df[field] = df[field].astype("boolean")
 
     # Drop summary and historic rows, keeping only the records of students who were
     # or will actually be enrolled at some point in time. The first NaN corresponds
     # to the first blank source cell and indicates the end of these students.
     try:
-        nan_index_pos = df.index.tolist().index(np.NaN)
+        nan_index_pos = df.index.tolist().index(np.nan)
         df = df.iloc[:nan_index_pos]
     except ValueError:
         # Otherwise use the length of the DataFrame (e.g., if summary later removed)
         pass
 
-    if is_course_code(args.name):
-        return summarize_course(args, df)
-    if is_term_code(args.name):
-        return summarize_term(args, df)
+    # A hand-edited column may mix types (e.g., dates and notes in BS Expected),
+    # which Parquet cannot store; keep such columns as text, cached or not
+    for field in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[field], skipna=True).startswith("mixed"):
+            text = df[field].where(df[field].isna(), df[field].astype(str))
+            df[field] = text.infer_objects()  # the dtype Parquet reads it back as
+
+    return df
+
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "msml")
+CACHE_VERSION = 2  # bump when read_msml's cleaning changes
+
+
+def _cache_path(cache_dir, source_path, ext):
+    """Return the path in cache_dir, with extension ext, kept for a master file."""
+    stem = hashlib.sha224(os.path.abspath(source_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, stem + ext)
+
+
+def _cache_paths(cache_dir, source_path):
+    """Return (Parquet, JSON key) sidecar paths for a master file."""
+    return tuple(
+        _cache_path(cache_dir, source_path, ext) for ext in (".parquet", ".json")
+    )
+
+
+def _replace_atomically(path, write):
+    """Call write(temporary path), then move the result to path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_json(path, obj):
+    """Write obj to path as JSON."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(obj, file)
+
+
+def load_msml(source_path, cache_dir=DEFAULT_CACHE):
+    """
+    Return read_msml(source_path), from a Parquet sidecar cache when it is current.
+
+    The cache is keyed on the source's size and mtime, so a hit needs only a stat
+    of the (possibly locked) workbook. When they differ, the workbook's sha224
+    decides, so a touched but unchanged file is not parsed again. With cache_dir
+    None, the workbook is always read. A DataFrame that cannot be stored as
+    Parquet (e.g., pyarrow missing) is returned uncached, with a warning.
+    """
+    if cache_dir is None:
+        with safe_file_access(source_path) as accessible_file_path:
+            return read_msml(accessible_file_path)
+
+    data_path, key_path = _cache_paths(cache_dir, source_path)
+    stat = os.stat(source_path)
+    key = {"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    try:
+        with open(key_path, "r", encoding="utf-8") as file:
+            cached_key = json.load(file)
+    except (OSError, ValueError):
+        cached_key = {}
+    have_data = os.path.exists(data_path)
+    if have_data and all(cached_key.get(k) == v for k, v in key.items()):
+        return pd.read_parquet(data_path)
+
+    with safe_file_access(source_path, cache_dir) as accessible_file_path:
+        with open_shared(accessible_file_path) as file:
+            key["sha224"] = hashlib.file_digest(file, "sha224").hexdigest()
+        unchanged = have_data and cached_key.get("version") == CACHE_VERSION
+        unchanged = unchanged and cached_key.get("sha224") == key["sha224"]
+        if unchanged:
+            df = pd.read_parquet(data_path)
+        else:
+            df = read_msml(accessible_file_path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if not unchanged:
+            _replace_atomically(data_path, df.to_parquet)
+        _replace_atomically(key_path, lambda path: _write_json(path, key))
+    except (ImportError, OSError, TypeError, ValueError) as e:
+        warn(f"Master file not cached: {e}")
+    return df
+
+
+def answer(args, df, enrolled=None):
+    """
+    Answer the query in args.name: a course code, a term code, or a student.
+
+    enrolled is build_enrollments(df), built here if not given.
+    """
+    if is_course_code(args.name) or is_term_code(args.name):
+        if enrolled is None:
+            enrolled = build_enrollments(df)
+        if is_course_code(args.name):
+            return summarize_course(args, enrolled)
+        return summarize_term(args, df, enrolled)
     return summarize_student(args, df)
 
 
+def file_version(path):
+    """Return (size, mtime_ns) of path, which changes when the file is saved."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def interactive(args, df):
+    """
+    Answer queries typed at a prompt until EOF or 'quit', loading the file once.
+
+    The master file is reloaded (through the cache) when it changes between
+    queries; if that fails, the previous load is kept and retried next query.
+    A failed query is reported and the prompt continues.
+    """
+    with contextlib.suppress(ImportError):
+        # Imported for its side effect: line editing and history for input()
+        import readline  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
+
+    version, enrolled = file_version(args.file), build_enrollments(df)
+    print("Enter LastName | LastName_FirstName | CourseCode | TermCode, or quit.")
+    while True:
+        try:
+            query = input("msml> ").strip()
+        except EOFError:
+            print()
+            return 0
+        if query in ("quit", "exit"):
+            return 0
+        if not query:
+            continue
+
+        start = time.perf_counter()
+        # The file may be briefly missing or partly written while it syncs
+        try:
+            current = file_version(args.file)
+            if current != version:
+                print("Master file changed, reloading.")
+                reloaded = load_msml(args.file, None if args.no_cache else args.cache)
+                df, enrolled = reloaded, build_enrollments(reloaded)
+                version = current
+        except Exception as e:
+            print(f"Reload failed, using previous load: {type(e).__name__}: {e}")
+        try:
+            answer(argparse.Namespace(**{**vars(args), "name": query}), df, enrolled)
+        except Exception as e:
+            print(f"Query failed: {type(e).__name__}: {e}")
+        print(f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+
+def main(args):
+    """Perform actions requested by command line arguments."""
+    df = load_msml(args.file, None if args.no_cache else args.cache)
+
+    if args.interactive:
+        return interactive(args, df)
+    if args.audit:
+        return summarize_audit(args, df, build_enrollments(df))
+    if args.reconcile:
+        return summarize_reconcile(args, df, build_enrollments(df))
+    if args.demand:
+        return summarize_demand(args, build_enrollments(df))
+    return answer(args, df)
+
+
 if __name__ == "__main__":
     # execute only if run as a script
 
@@ -362,8 +971,52 @@ if __name__ == "__main__":
     parser.add_argument(
         "name",
         type=str,
+        nargs="?",
         help="LastName (if unique) | LastName_FirstName | CourseCode | TermCode",
     )
+    parser.add_argument(
+        "-i",
+        "--interactive",
+        action="store_true",
+        help="Load the file once, then answer queries typed at a prompt",
+    )
+    parser.add_argument(
+        "-a",
+        "--audit",
+        action="store_true",
+        help="Check degree requirements for every student at once",
+    )
+    parser.add_argument(
+        "-r",
+        "--reconcile",
+        action="store_true",
+        help="Compare every student's master file and STAT plans",
+    )
+    parser.add_argument(
+        "-d",
+        "--demand",
+        action="store_true",
+        help="Tabulate planned seats per course and term, future and history",
+    )
+    parser.add_argument(
+        "--current",
+        type=str,
+        help="First future term for -d/--demand (default: today's term)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Worker processes for loading STAT plans (default: CPUs)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help="File written by -a/--audit (default: audit.xlsx), -r/--reconcile "
+        "(default: reconcile.xlsx) or -d/--demand (default: demand.xlsx; "
+        "may also be .parquet)",
+    )
     parser.add_argument(
         "-f",
         "--file",
@@ -371,4 +1024,23 @@ if __name__ == "__main__":
         default=os.path.join(os.path.expanduser("~"), *data_path),
         help="File to analyze",
     )
-    main(parser.parse_args())
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=DEFAULT_CACHE,
+        help="Directory for the cleaned master file cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Read the master file without the cache",
+    )
+    cli_args = parser.parse_args()
+    modes = [cli_args.interactive, cli_args.audit, cli_args.reconcile, cli_args.demand]
+    if (cli_args.name is not None) + sum(modes) != 1:
+        parser.error("Give one of a name, -i/--interactive, -a, -r or -d")
+    if cli_args.current is not None and not is_term_code(cli_args.current):
+        parser.error(f"--current {cli_args.current!r} is not a term code, e.g. 1S26")
+    if cli_args.jobs is not None and cli_args.jobs < 1:
+        parser.error(f"Number of jobs ({cli_args.jobs}) must be at least 1")
+    main(cli_args)
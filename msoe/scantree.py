@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+Find files under slow (cloud-synced) directory trees with as few stat calls as possible.
+
+Built on os.scandir: directory entries carry their type, so files and
+directories are told apart without a stat; each directory entered is stat'ed
+once (to detect link loops), and the stat of each matching file is taken once
+and returned for reuse. Directories named in prune are never entered.
+"""
+
+import argparse
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
+
+
+def directory_key(path, stat):
+    """
+    Return a key identifying the directory at path, given its os.stat result.
+
+    This is (st_dev, st_ino), except where the filesystem reports st_ino as 0
+    (some Windows and cloud-sync drivers), when the resolved path is used instead.
+    """
+    if stat.st_ino:
+        return stat.st_dev, stat.st_ino
+    return os.path.realpath(path)
+
+
+def scan_tree(root, pattern="*", prune=(), skip_hidden=False):
+    """
+    Yield (path, stat_result) for files under root whose names match pattern.
+
+    pattern is an fnmatch pattern applied to the file name (case-insensitive where
+    the OS is). Directories whose names are in prune, and with skip_hidden those
+    beginning with '.', are not entered; directories that cannot be read are
+    skipped, as os.walk does. Symbolic links to directories are followed, as
+    recursive glob does, but a directory reached twice (e.g., through a link
+    loop) is scanned only once.
+    """
+    # As fnmatch.fnmatch, but compiled once rather than per entry
+    normcase = os.path.normcase
+    match = re.compile(translate(normcase(pattern))).match
+    visited = set()  # directory_key of directories scanned
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            # One stat per directory; scandir's own stat lacks st_ino on Windows
+            key = directory_key(directory, os.stat(directory))
+            if key in visited:
+                continue
+            visited.add(key)
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    if skip_hidden and entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir():
+                            if entry.name not in prune:
+                                subdirs.append(entry.path)
+                        elif match(normcase(entry.name)):
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue  # vanished or unreadable entry
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))  # visit in directory order
+
+
+def scan_roots(roots, pattern="*", prune=(), skip_hidden=False, workers=1):
+    """
+    Return one list of (path, stat_result) per root, as from scan_tree.
+
+    With workers > 1 the roots are scanned concurrently on a thread pool; the
+    work is dominated by I/O latency, so threads overlap it well. Results keep the
+    order of roots either way.
+    """
+
+    def scan(root):
+        return list(scan_tree(root, pattern, prune, skip_hidden))
+
+    if workers == 1 or len(roots) < 2:
+        return [scan(root) for root in roots]
+    with ThreadPoolExecutor(max_workers=min(workers, len(roots))) as executor:
+        return list(executor.map(scan, roots))
+
+
+if __name__ == "__main__":
+    # execute only if run as a script
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("roots", nargs="+", help="Directories to scan")
+    parser.add_argument("-p", "--pattern", default="*", help="File name pattern")
+    parser.add_argument(
+        "-x", "--prune", nargs="*", default=[], help="Directory names not to enter"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Roots scanned concurrently"
+    )
+    cli_args = parser.parse_args()
+    if cli_args.jobs < 1:
+        parser.error(f"Number of jobs ({cli_args.jobs}) must be at least 1")
+    for found in scan_roots(
+        cli_args.roots, cli_args.pattern, set(cli_args.prune), workers=cli_args.jobs
+    ):
+        for path, _ in found:
+            print(path)
@@ -2,23 +2,35 @@
 
 """Summarize MSOE EECS SO XLSX files recursively."""
 
-# TODO: order by outcome number, course number, section
-
-# TODO: Add columns (N>=pro,N) to summarize as required by process.
-
-# TODO: Format row bands per outcome
-
 # TODO: Year should default to current AY
 
-# TODO: Select year range
-
 import argparse
+import contextlib
+import csv
+import itertools
+import json
 import os
 import re
-from datetime import datetime
+import sqlite3
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from xml.etree import ElementTree
 
+import numpy as np
 import openpyxl
 import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+from openpyxl.styles.numbers import (
+    builtin_format_code,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+
+from scantree import scan_roots
 
 TIME_TAG = datetime.now().strftime(
     "%G%m%dT%H%M%S"
@@ -37,6 +49,13 @@ LEVEL = ["Exemplary", "Accomplished", "Proficient", "Developing", "Beginning"]
 
 PROGRAM = {"BME", "CE", "CS", "EE", "SE"}
 
+# Output columns: directory labels, form contents, then per-form summary counts
+FORM_COLUMNS = ["Program Code", "AY", *METADATA, *LEVEL]
+SUMMARY_COLUMNS = ["N>=Proficient", "N"]
+SORT_COLUMNS = ["Program Code", "AY", "Outcome", "Course Number", "Section"]
+BAND_COLUMNS = SORT_COLUMNS[:3]  # alternate fill when these change
+BAND_FILL = PatternFill("solid", fgColor="DDEBF7")
+
 # extract just outcome number from longer string
 OUTCOME_NUMBER = [
     re.compile(r"^\((\w+)\)"),  # < AY20
@@ -44,20 +63,213 @@ OUTCOME_NUMBER = [
 ]
 
 
-def get_so_data(full_path):
-    """Read summary SO assessment data from the given XLSX file."""
-    level_rows = [24, 28, 32, 36, 40]
-    level_cols = {"Level_str": "D", "Level_int": "F", "Count": "G", "Percentage": "F"}
+LEVEL_ROWS = [24, 28, 32, 36, 40]
+LEVEL_COLS = {"Level_str": "D", "Level_int": "F", "Count": "G", "Percentage": "F"}
 
+# Every cell get_so_data reads; nothing below the last level row is needed
+FORM_CELLS = [
+    *METADATA.values(),
+    LEVEL_COLS["Level_str"] + f"{LEVEL_ROWS[0]}",
+    *(LEVEL_COLS["Count"] + f"{row}" for row in LEVEL_ROWS),
+]
+
+
+def read_cells_openpyxl(full_path, cells):
+    """Return {cell: value} from the Form sheet via openpyxl's full object model."""
     workbook = openpyxl.load_workbook(full_path, data_only=True)  # values, not formulas
     sheet = workbook["Form"]
+    return {cell: sheet[cell].value for cell in cells}
+
+
+def read_cells_read_only(full_path, cells):
+    """Return {cell: value} from the Form sheet via openpyxl's streaming reader."""
+    workbook = openpyxl.load_workbook(full_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook["Form"]
+        wanted = set(cells)
+        max_row = max(openpyxl.utils.cell.coordinate_to_tuple(c)[0] for c in cells)
+        values = dict.fromkeys(cells)
+        for row in sheet.iter_rows(max_row=max_row):
+            for cell in row:
+                if getattr(cell, "coordinate", None) in wanted:
+                    values[cell.coordinate] = cell.value
+        return values
+    finally:
+        workbook.close()  # read-only workbooks keep the zip open
+
+
+_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_MAIN = "{%s}" % _NS["main"]
+
+
+def _form_sheet_path(archive):
+    """Return the zip member holding the Form sheet's XML."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheet = workbook.find("main:sheets/main:sheet[@name='Form']", _NS)
+    if sheet is None:
+        raise KeyError("Worksheet Form does not exist.")
+    rel_id = sheet.get(f"{{{_NS['r']}}}id")
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.findall("rel:Relationship", _NS):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise KeyError(f"No relationship {rel_id} for worksheet Form.")
+
+
+def _shared_strings(archive, indices):
+    """Return {index: text} for the requested shared strings, reading no further."""
+    if not indices or "xl/sharedStrings.xml" not in archive.namelist():
+        return {}
+    strings, last, index = {}, max(indices), 0
+    with archive.open("xl/sharedStrings.xml") as file:
+        for _, elem in ElementTree.iterparse(file):
+            if elem.tag != _MAIN + "si":
+                continue
+            if index in indices:
+                # Plain <t> or rich-text runs <r><t>; skip phonetic <rPh> text
+                parts = []
+                for child in elem:
+                    if child.tag == _MAIN + "t":
+                        parts.append(child.text or "")
+                    elif child.tag == _MAIN + "r":
+                        parts.append(child.findtext(_MAIN + "t") or "")
+                strings[index] = "".join(parts)
+            elem.clear()
+            if index == last:
+                break
+            index += 1
+    return strings
+
+
+def _date_styles(archive, style_ids):
+    """
+    Return {style index: is timedelta} for the given styles that format dates.
+
+    Only the cellXfs entries for the requested styles are looked up, as openpyxl
+    does for every style when it loads the workbook.
+    """
+    if not style_ids or "xl/styles.xml" not in archive.namelist():
+        return {}
+    styles = ElementTree.fromstring(archive.read("xl/styles.xml"))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in styles.iterfind("main:numFmts/main:numFmt", _NS)
+    }
+    xfs = styles.findall("main:cellXfs/main:xf", _NS)
+    dates = {}
+    for style_id in style_ids:
+        if style_id >= len(xfs):
+            continue
+        fmt_id = int(xfs[style_id].get("numFmtId", 0))
+        fmt = custom.get(fmt_id) or builtin_format_code(fmt_id)
+        if fmt and is_date_format(fmt):
+            dates[style_id] = is_timedelta_format(fmt)
+    return dates
+
+
+def _workbook_epoch(archive):
+    """Return the epoch the workbook's date serials count from."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    properties = workbook.find("main:workbookPr", _NS)
+    date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+    return MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+
+def _cell_value(kind, raw, date_style=None, epoch=WINDOWS_EPOCH):
+    """
+    Convert a cell's raw XML value to the Python type openpyxl would return.
+
+    date_style is None for a number without a date format, otherwise whether
+    the format is a duration.
+    """
+    if raw is None:
+        return None
+    if kind in ("str", "inlineStr", "e"):
+        return raw
+    if kind == "d":
+        return from_ISO8601(raw)
+    if kind == "b":
+        return raw == "1"
+    if "." in raw or "E" in raw or "e" in raw:
+        value = float(raw)
+    else:
+        value = int(raw)
+    if date_style is not None:
+        with contextlib.suppress(OverflowError, ValueError):
+            # openpyxl reports an out of range serial as an error value
+            return from_excel(value, epoch, timedelta=date_style)
+        return "#VALUE!"
+    return value
+
+
+def read_cells_xml(full_path, cells):
+    """
+    Return {cell: value} by streaming the Form sheet's XML directly from the xlsx zip.
+
+    Only the requested cells are decoded, parsing stops after the last row that
+    holds one of them, and only the shared strings they reference are resolved.
+    Cached formula results are returned, as with openpyxl's data_only=True, and
+    numbers with a date format become datetimes as they do there.
+    """
+    wanted = set(cells)
+    max_row = max(int(re.sub(r"^[A-Z]+", "", c)) for c in cells)
+    raw = {}  # cell -> (type, raw value, style index)
+    row_number = 0
+    with zipfile.ZipFile(full_path) as archive:
+        with archive.open(_form_sheet_path(archive)) as file:
+            for _, elem in ElementTree.iterparse(file):
+                if elem.tag == _MAIN + "c":
+                    ref = elem.get("r")
+                    if ref in wanted:
+                        kind = elem.get("t", "n")
+                        if kind == "inlineStr":
+                            value = "".join(elem.itertext())
+                        else:
+                            value = elem.findtext(_MAIN + "v")
+                        raw[ref] = (kind, value, int(elem.get("s", 0)))
+                elif elem.tag == _MAIN + "row":
+                    row_number = int(elem.get("r") or row_number + 1)
+                    elem.clear()  # after reading r, which clear() removes
+                    if row_number >= max_row:
+                        break
+        shared = _shared_strings(
+            archive, {int(v) for k, v, _ in raw.values() if k == "s" and v is not None}
+        )
+        numbers = {s for k, v, s in raw.values() if k == "n" and v is not None}
+        dates = _date_styles(archive, numbers)
+        epoch = _workbook_epoch(archive) if dates else WINDOWS_EPOCH
+
+    values = dict.fromkeys(cells)
+    for ref, (kind, value, style) in raw.items():
+        if kind == "s":
+            values[ref] = shared[int(value)] if value is not None else None
+        else:
+            values[ref] = _cell_value(kind, value, dates.get(style), epoch)
+    return values
+
+
+LOADERS = {
+    "xml": read_cells_xml,
+    "read_only": read_cells_read_only,
+    "openpyxl": read_cells_openpyxl,
+}
+
+
+def get_so_data(full_path, loader="xml"):
+    """Read summary SO assessment data from the given XLSX file."""
+    values = LOADERS[loader](full_path, FORM_CELLS)
     assert (
-        sheet[level_cols["Level_str"] + f"{level_rows[0]}"].value == LEVEL[0]
+        values[LEVEL_COLS["Level_str"] + f"{LEVEL_ROWS[0]}"] == LEVEL[0]
     ), "Unexpected format: did not find highest level description where expected"
 
     data_values = []
     for field, cell in METADATA.items():
-        value = sheet[cell].value
+        value = values[cell]
         if field == "Outcome":
             for pattern in OUTCOME_NUMBER:
                 if result := pattern.match(value):
@@ -65,33 +277,410 @@ def get_so_data(full_path):
                     break
         data_values.append(value)
 
-    for row in level_rows:
-        data_values.append(sheet[level_cols["Count"] + f"{row}"].value)
+    for row in LEVEL_ROWS:
+        data_values.append(values[LEVEL_COLS["Count"] + f"{row}"])
 
     return data_values
 
 
+def try_get_so_data(full_path, loader="xml"):
+    """Return (data, None) from get_so_data, or (None, error message) if it fails."""
+    try:
+        return get_so_data(full_path, loader), None
+    except Exception as e:
+        # One malformed form should not abort a summary of hundreds
+        return None, f"{type(e).__name__}: {e}"
+
+
+def read_so_files(paths, jobs=1, loader="xml"):
+    """
+    Yield (path, data, error) for each path in order, as from try_get_so_data.
+
+    With jobs > 1, workbooks are parsed in that many worker processes; results are
+    still yielded in the order of paths.
+    """
+    if jobs == 1:
+        for path in paths:
+            yield path, *try_get_so_data(path, loader)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            try_get_so_data, paths, [loader] * len(paths), chunksize=4
+        )
+        for path, (data, error) in zip(paths, results):
+            yield path, data, error
+
+
+CACHE_VERSION = 2  # bump whenever the rows get_so_data returns change
+
+
+def open_so_cache(cache_path):
+    """Open (creating if needed) the SQLite cache of get_so_data rows."""
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        conn.execute("DROP TABLE IF EXISTS so_rows")  # rows from older code
+        conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS so_rows ("
+        "path TEXT, loader TEXT, mtime_ns INTEGER, size INTEGER, data TEXT, "
+        "PRIMARY KEY (path, loader))"
+    )
+    return conn
+
+
+_JSON_TYPES = {"datetime": datetime, "time": time}
+
+
+def _to_json(value):
+    """Encode a cell value JSON cannot hold, for _from_json to restore exactly."""
+    if isinstance(value, timedelta):
+        return {"$timedelta": value.total_seconds()}
+    for name, kind in _JSON_TYPES.items():
+        if isinstance(value, kind):
+            return {"$" + name: value.isoformat()}
+    raise TypeError(f"Cannot cache {type(value).__name__} value {value!r}")
+
+
+def _from_json(obj):
+    """Restore a value encoded by _to_json (json.loads object_hook)."""
+    if "$timedelta" in obj:
+        return timedelta(seconds=obj["$timedelta"])
+    for name, kind in _JSON_TYPES.items():
+        if "$" + name in obj:
+            return kind.fromisoformat(obj["$" + name])
+    return obj
+
+
+def read_so_files_cached(paths, conn, jobs=1, loader="xml", stats=None):
+    """
+    Yield (path, data, error, cached) for each path in order.
+
+    Rows are reused from the cache when a file's mtime and size are unchanged and it
+    was read with the same loader; only the remaining files are parsed (via
+    read_so_files) and their rows stored. Files that fail are not cached, so they
+    are retried next run. stats may supply os.stat_result per path (e.g. from
+    scan_roots) to avoid statting again.
+    """
+    stats = stats or {path: os.stat(path) for path in paths}
+    cached = {}
+    for path in paths:
+        row = conn.execute(
+            "SELECT data FROM so_rows "
+            "WHERE path = ? AND loader = ? AND mtime_ns = ? AND size = ?",
+            (path, loader, stats[path].st_mtime_ns, stats[path].st_size),
+        ).fetchone()
+        if row:
+            cached[path] = json.loads(row[0], object_hook=_from_json)
+
+    parsed = read_so_files([p for p in paths if p not in cached], jobs, loader)
+    with conn:  # commit once, after every changed form is stored
+        for path in paths:
+            if path in cached:
+                yield path, cached[path], None, True
+                continue
+            _, data, error = next(parsed)
+            if error is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO so_rows VALUES (?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        loader,
+                        stats[path].st_mtime_ns,
+                        stats[path].st_size,
+                        json.dumps(data, default=_to_json),
+                    ),
+                )
+            yield path, data, error, False
+
+
+def parse_years(text):
+    """Parse a 4-digit academic year or an inclusive range such as 2018-2021."""
+    first, _, last = text.partition("-")
+    try:
+        years = range(int(first), int(last or first) + 1)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid year or range: {text}") from e
+    if not years:
+        raise argparse.ArgumentTypeError(f"Empty year range: {text}")
+    return years
+
+
+def add_summary_columns(dataframe):
+    """Add per-form N>=Proficient and N columns computed from the level counts."""
+    counts = dataframe[LEVEL].apply(pd.to_numeric, errors="coerce").fillna(0)
+    at_least_proficient = LEVEL[: LEVEL.index("Proficient") + 1]
+    dataframe["N>=Proficient"] = counts[at_least_proficient].sum(axis=1).astype(int)
+    dataframe["N"] = counts.sum(axis=1).astype(int)
+    return dataframe
+
+
+def summarize_outcomes(dataframe):
+    """Total N>=Proficient and N per program, academic year and outcome."""
+    summary = (
+        dataframe.groupby(["Program Code", "AY", "Outcome"])[["N>=Proficient", "N"]]
+        .sum()
+        .reset_index()
+    )
+    summary["Fraction Proficient"] = summary["N>=Proficient"] / summary["N"]
+    return summary
+
+
+def band_rows(dataframe):
+    """Return a boolean Series marking every other group of BAND_COLUMNS for shading."""
+    keys = dataframe[BAND_COLUMNS]
+    group = (keys != keys.shift()).any(axis=1).cumsum()
+    return group % 2 == 0
+
+
+def _number(value):
+    """Return value as a float, or None if it is not numeric (as pd.to_numeric)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sqlite_order(column):
+    """
+    Return a sort key ordering column as SQLite's ORDER BY does for the spool.
+
+    NULLs come first, then numbers by value, then text, then the BLOBs that
+    _spool_value encodes other values as, so Section 2 sorts before Section 10
+    whether or not rows are streamed.
+    """
+
+    def key(value):
+        if pd.isna(value):
+            return (0, 0)
+        if isinstance(value, (bool, int, float, np.number)):
+            return (1, value)
+        if isinstance(value, str):
+            return (2, value)
+        return (3, _spool_value(value))
+
+    return column.map(key)
+
+
+def _text(value):
+    """Return value as a string, keeping None (Section may be numeric or text)."""
+    return None if value is None else str(value)
+
+
+def _spool_value(value):
+    """
+    Return value as stored in the spool.
+
+    SQLite holds None, numbers and text as they are; other cell values (dates,
+    times and durations) are stored as BLOBs of _to_json's encoding, which
+    _unspool_value restores, rather than through sqlite3's default adapters.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(value, default=_to_json).encode()
+
+
+def _unspool_value(value):
+    """Restore a value stored by _spool_value."""
+    if isinstance(value, bytes):
+        return json.loads(value, object_hook=_from_json)
+    return value
+
+
+def open_spool(directory):
+    """Open an on-disk table that rows are streamed into, so sorting needs no RAM."""
+    conn = sqlite3.connect(os.path.join(directory, "spool.sqlite"))
+    columns = ", ".join(f"c{i}" for i in range(len(FORM_COLUMNS + SUMMARY_COLUMNS)))
+    conn.execute(f"CREATE TABLE forms ({columns})")
+    return conn
+
+
+def spool_row(conn, row):
+    """Append one FORM_COLUMNS row and its N>=Proficient and N counts to the spool."""
+    counts = [_number(count) or 0 for count in row[-len(LEVEL) :]]
+    at_least_proficient = sum(counts[: LEVEL.index("Proficient") + 1])
+    values = [*map(_spool_value, row), int(at_least_proficient), int(sum(counts))]
+    conn.execute(f"INSERT INTO forms VALUES ({', '.join('?' * len(values))})", values)
+
+
+def _spooled(conn, batch=4096):
+    """Yield (header, row iterator) for the sorted forms and the outcome summary."""
+    columns = FORM_COLUMNS + SUMMARY_COLUMNS
+    col = {name: f"c{i}" for i, name in enumerate(columns)}
+    order = ", ".join(col[name] for name in SORT_COLUMNS)
+    group = ", ".join(col[name] for name in BAND_COLUMNS)
+
+    def rows(query):
+        cursor = conn.execute(query)
+        while chunk := cursor.fetchmany(batch):
+            for row in chunk:
+                yield tuple(map(_unspool_value, row))
+
+    yield columns, rows(f"SELECT * FROM forms ORDER BY {order}")
+    summary = rows(
+        f"SELECT {group}, SUM({col['N>=Proficient']}), SUM({col['N']}) "
+        f"FROM forms GROUP BY {group} ORDER BY {group}"
+    )
+    yield BAND_COLUMNS + SUMMARY_COLUMNS + ["Fraction Proficient"], (
+        (*row, row[-2] / row[-1] if row[-1] else None) for row in summary
+    )
+
+
+def write_spooled(conn, output):
+    """
+    Stream spooled rows, ordered by SORT_COLUMNS, to an xlsx, csv or parquet file.
+
+    xlsx uses openpyxl's write-only mode, puts the outcome summary on a second
+    sheet, and bands rows per outcome. csv and parquet write the summary beside
+    the output as <name>-summary.<ext>.
+    """
+    stem, ext = os.path.splitext(output)
+    (form_header, form_rows), (summary_header, summary_rows) = _spooled(conn)
+    if ext == ".xlsx":
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Forms")
+        sheet.append(form_header)
+        band_index = [form_header.index(name) for name in BAND_COLUMNS]
+        last_key, shaded = None, True
+        for row in form_rows:
+            key = [row[i] for i in band_index]
+            if key != last_key:
+                last_key, shaded = key, not shaded
+            cells = []
+            for value in row:
+                cells.append(WriteOnlyCell(sheet, value))
+                if shaded:
+                    cells[-1].fill = BAND_FILL
+            sheet.append(cells)
+        sheet = workbook.create_sheet("Summary")
+        sheet.append(summary_header)
+        for row in summary_rows:
+            sheet.append(row)
+        workbook.save(output)
+    elif ext == ".csv":
+        for path, header, rows in [
+            (output, form_header, form_rows),
+            (f"{stem}-summary{ext}", summary_header, summary_rows),
+        ]:
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(rows)
+    elif ext == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        integer = {"AY", *SUMMARY_COLUMNS}
+        numeric = {"Percent Proficient", "Fraction Proficient", *LEVEL}
+        for path, header, rows in [
+            (output, form_header, form_rows),
+            (f"{stem}-summary{ext}", summary_header, summary_rows),
+        ]:
+            types = [
+                (
+                    pa.int64()
+                    if n in integer
+                    else pa.float64() if n in numeric else pa.string()
+                )
+                for n in header
+            ]
+            convert = [
+                (int if n in integer else _number if n in numeric else _text)
+                for n in header
+            ]
+            schema = pa.schema(list(zip(header, types)))
+            with pq.ParquetWriter(path, schema) as writer:
+                while batch := list(itertools.islice(rows, 4096)):
+                    columns = [
+                        [to(v) for v in values]
+                        for to, values in zip(convert, zip(*batch))
+                    ]
+                    writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+    else:
+        raise ValueError(f"Unsupported output format: {output}")
+
+
 def main(args):
     """Summarize MSOE EECS SO XLSX files recursively."""
     all_data = []
-    assert args.program in PROGRAM, f"Program code {args.program} is not recognized"
+    unknown = set(args.program) - PROGRAM
+    assert not unknown, f"Program code(s) {sorted(unknown)} not recognized"
+    years = sorted({year for year_range in args.year for year in year_range})
+    assert all(
+        1980 < year < 2999 for year in years
+    ), f"Academic years ({years}) must be in 4-digit format"
+    assert args.jobs >= 1, f"Number of jobs ({args.jobs}) must be at least 1"
     assert (
-        1980 < args.year < 2999
-    ), f"Academic year ({args.year}) must be in 4-digit format"
-    for dirpath, _, filenames in os.walk(
-        os.path.join(args.directory, args.program, str(args.year))
+        args.scan_jobs >= 1
+    ), f"Number of scan jobs ({args.scan_jobs}) must be at least 1"
+    assert args.stream or args.output.endswith(
+        ".xlsx"
+    ), "Only --stream can write formats other than .xlsx"
+    dirs = [(program, year) for program in args.program for year in years]
+    paths, labels, stats = [], {}, {}  # labels: path -> (program, year) from directory
+    for label, found in zip(
+        dirs,
+        scan_roots(
+            [os.path.join(args.directory, p, str(y)) for p, y in dirs],
+            "*.xlsx",
+            workers=args.scan_jobs,
+        ),
     ):
-        for filename in filenames:
-            if filename.endswith(".xlsx"):
-                full_path = os.path.join(dirpath, filename)
+        for path, stat in found:
+            paths.append(path)
+            labels[path], stats[path] = label, stat
+
+    errors, n_cached = [], 0
+    with contextlib.ExitStack() as stack:
+        spool = None
+        if args.stream:
+            spool = open_spool(stack.enter_context(tempfile.TemporaryDirectory()))
+            stack.callback(spool.close)  # registered last, so closed before rmtree
+        if args.no_cache:
+            results = (
+                (*result, False)
+                for result in read_so_files(paths, args.jobs, args.loader)
+            )
+        else:
+            conn = stack.enter_context(contextlib.closing(open_so_cache(args.cache)))
+            results = read_so_files_cached(paths, conn, args.jobs, args.loader, stats)
+        for full_path, data, error, cached in results:
+            if cached:
+                n_cached += 1
+            else:
                 print(full_path)
-                all_data.append(get_so_data(full_path))
+            if error:
+                errors.append((full_path, error))
+            elif spool:
+                spool_row(spool, [*labels[full_path], *data])
+            else:
+                all_data.append([*labels[full_path], *data])
+        if n_cached:
+            print(f"{n_cached} of {len(paths)} files unchanged since a previous run")
 
-    col_names = list(METADATA.keys())
-    col_names.extend(LEVEL)
+        if errors:
+            print(f"\n{len(errors)} of {len(paths)} files could not be summarized:")
+            for full_path, error in errors:
+                print(f"{full_path}\n    {error}")
 
-    dataframe = pd.DataFrame(all_data, columns=col_names)
-    dataframe.to_excel(TIME_TAG + ".xlsx")
+        if spool:
+            write_spooled(spool, args.output)
+            return
+
+    dataframe = add_summary_columns(pd.DataFrame(all_data, columns=FORM_COLUMNS))
+    dataframe = dataframe.sort_values(
+        SORT_COLUMNS, key=_sqlite_order, ignore_index=True
+    )
+    with pd.ExcelWriter(args.output) as writer:
+        dataframe.to_excel(writer, sheet_name="Forms")
+        sheet = writer.sheets["Forms"]
+        for row, shaded in enumerate(band_rows(dataframe), start=2):  # after header
+            if shaded:
+                for cell in sheet[row]:
+                    cell.fill = BAND_FILL
+        summarize_outcomes(dataframe).to_excel(
+            writer, sheet_name="Summary", index=False
+        )
 
 
 if __name__ == "__main__":
@@ -108,10 +697,20 @@ if __name__ == "__main__":
         description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument(
-        "-p", "--program", type=str, default="CE", help="Academic program code"
+        "-p",
+        "--program",
+        type=str,
+        nargs="+",
+        default=["CE"],
+        help="Academic program code(s)",
     )
     parser.add_argument(
-        "-y", "--year", type=int, default=2020, help="4-digit academic year"
+        "-y",
+        "--year",
+        type=parse_years,
+        nargs="+",
+        default=[range(2020, 2021)],
+        help="4-digit academic year(s) or inclusive ranges, e.g. 2018-2021",
     )
     parser.add_argument(
         "-d",
@@ -120,4 +719,45 @@ if __name__ == "__main__":
         default=os.path.join(os.path.expanduser("~"), *assessment_path),
         help="Directory to analyze",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for parsing workbooks",
+    )
+    parser.add_argument(
+        "--scan-jobs",
+        type=int,
+        default=4,
+        help="Program/year directories scanned concurrently",
+    )
+    parser.add_argument(
+        "-l",
+        "--loader",
+        choices=LOADERS,
+        default="xml",
+        help="Workbook reader: direct sheet XML, openpyxl read-only, or full openpyxl",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=TIME_TAG + ".xlsx",
+        help="Output file; with --stream, may also be .csv or .parquet",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Spool rows to disk as forms are read, keeping memory use flat",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=os.path.join(os.path.expanduser("~"), ".cache", "so", "so_rows.sqlite"),
+        help="SQLite cache of rows from previously read forms",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Read every form, ignoring the cache"
+    )
     main(parser.parse_args())